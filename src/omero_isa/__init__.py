@@ -1 +1,14 @@
-from omero_isa.isa_packer import pack_isa
\ No newline at end of file
+import logging
+
+# library users opt in to the importer's progress messages by configuring
+# logging; the omero-isa CLI sends them to stdout
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def __getattr__(name):
+    # pack_isa is resolved lazily so that importing omero_isa.cli does not
+    # pull in isatools and omero via the packer
+    if name == "pack_isa":
+        from omero_isa.isa_packer import pack_isa
+        return pack_isa
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,236 @@
+"""
+Connection-pooling agent for the omero-isa CLI.
+
+Logging in to OMERO (TLS handshake, Ice session creation) dominates the run
+time of small imports. When many investigations are imported from a script,
+``omero-isa --daemon`` can be started once; it listens on a Unix domain
+socket and keeps logged-in BlitzGateway connections alive between CLI calls.
+Subsequent ``omero-isa`` invocations detect the socket and hand the import
+over to the agent instead of connecting themselves.
+
+The protocol is one JSON object per line in each direction. A request
+carries the CLI arguments, a response either the created project or the
+name and message of the exception raised by the import.
+
+Classes:
+    ConnectionPool: Keeps one BlitzGateway per server, port and credentials
+
+Functions:
+    serve: Run the agent until interrupted
+    request_import: Send an import request to a running agent
+
+"""
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import threading
+
+# seconds between keep-alive calls on idle pooled connections
+KEEPALIVE_INTERVAL = 60
+
+# seconds to wait for the agent to accept a request
+CONNECT_TIMEOUT = 5
+
+# seconds to wait for the agent to finish an import (ISA_AGENT_TIMEOUT)
+REPLY_TIMEOUT = float(os.environ.get("ISA_AGENT_TIMEOUT", 6 * 3600))
+
+
+class ConnectionPool:
+    """Pool of logged-in BlitzGateway connections.
+
+    Connections are keyed by server, port, username and a hash of the
+    password, so a request with different credentials never reuses a
+    session it did not authenticate.
+
+    Attributes:
+        connect (callable): Function with the signature of
+            ``omero_isa.cli.connect_to_omero`` used to open new connections.
+    """
+
+    def __init__(self, connect):
+        """Initialize the ConnectionPool.
+
+        Args:
+            connect (callable): Opens a new connection from
+                (username, password, server, port).
+        """
+        self.connect = connect
+        self._conns = {}
+        self._lock = threading.Lock()
+
+    def get(self, username, password, server, port):
+        """Return a live connection, reconnecting if the session expired.
+
+        Args:
+            username (str): OMERO username.
+            password (str): OMERO password.
+            server (str): OMERO server hostname.
+            port (int): OMERO server port.
+
+        Returns:
+            omero.gateway.BlitzGateway: A connected gateway.
+        """
+        digest = hashlib.sha256(password.encode("utf-8")).hexdigest()
+        key = (server, port, username, digest)
+        with self._lock:
+            conn = self._conns.get(key)
+            if conn is not None and not conn.keepAlive():
+                # session timed out or was closed on the server
+                self._close(key)
+                conn = None
+            if conn is None:
+                conn = self.connect(username, password, server, port)
+                self._conns[key] = conn
+            return conn
+
+    def keep_alive(self):
+        """Ping all pooled connections and drop the ones that are dead."""
+        with self._lock:
+            for key in list(self._conns):
+                try:
+                    alive = self._conns[key].keepAlive()
+                except Exception:
+                    alive = False
+                if not alive:
+                    self._close(key)
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            for key in list(self._conns):
+                self._close(key)
+
+    def _close(self, key):
+        conn = self._conns.pop(key)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def serve(socket_path, pool):
+    """Run the agent until interrupted.
+
+    Args:
+        socket_path (Path): Path of the Unix domain socket to listen on.
+        pool (ConnectionPool): Pool serving the connections.
+
+    Returns:
+        None
+    """
+    from omero_isa.cli import validate_investigation_file, import_arc_repository
+
+    class ImportHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            request = json.loads(self.rfile.readline())
+            try:
+                investigation_path, investigation_data = (
+                    validate_investigation_file(request["investigation_file"])
+                )
+                conn = pool.get(
+                    request["username"],
+                    request["password"],
+                    request["server"],
+                    request["port"],
+                )
+                project = import_arc_repository(
+                    conn,
+                    investigation_path,
+                    investigation_data,
+                    request["project_name"],
+                )
+                response = {
+                    "project_id": project.getId().getValue(),
+                    "project_name": project.getName().getValue(),
+                }
+            except Exception as e:
+                response = {"error": type(e).__name__, "message": str(e)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    stop = threading.Event()
+
+    def _keep_alive():
+        while not stop.wait(KEEPALIVE_INTERVAL):
+            pool.keep_alive()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+
+    # requests contain passwords, so only the owner may connect
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(str(socket_path), ImportHandler)
+    finally:
+        os.umask(old_umask)
+
+    threading.Thread(target=_keep_alive, daemon=True).start()
+    print(f"✓ omero-isa agent listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        pool.close()
+        os.unlink(socket_path)
+        print("✓ omero-isa agent stopped")
+
+
+def request_import(socket_path, request):
+    """Send an import request to a running agent.
+
+    Args:
+        socket_path (Path): Path of the agent's Unix domain socket.
+        request (dict): Import arguments (username, password, server, port,
+            project_name, investigation_file).
+
+    Returns:
+        dict or None: The agent's response, or None if no agent is
+            listening on socket_path.
+
+    Raises:
+        RuntimeError: If the agent did not reply within REPLY_TIMEOUT
+            seconds, or closed the connection without a valid reply, e.g.
+            because it died during the import. The import is not retried
+            here, it may have been partly done by the agent.
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            # stale socket file left behind by an agent that died, or an
+            # agent that does not accept requests
+            return None
+        sock.settimeout(REPLY_TIMEOUT)
+        with sock.makefile("rwb") as f:
+            try:
+                f.write(json.dumps(request).encode("utf-8") + b"\n")
+                f.flush()
+                reply = f.readline()
+            except socket.timeout:
+                raise RuntimeError(
+                    f"omero-isa agent did not reply within {REPLY_TIMEOUT:g} s"
+                )
+            except OSError as e:
+                raise RuntimeError(f"Lost connection to omero-isa agent: {e}")
+    finally:
+        sock.close()
+
+    try:
+        response = json.loads(reply)
+    except ValueError:
+        response = None
+    if not isinstance(response, dict):
+        raise RuntimeError(
+            "omero-isa agent closed the connection without a valid reply"
+        )
+    return response
@@ -1,9 +1,97 @@
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import hashlib
+import os
+import socket
 import sys
+import threading
 import json
+import logging
+import mmap
 from pathlib import Path
-from omero.gateway import BlitzGateway
-from omero_isa.isa_investigation_importer import IsaInvestigationImporter
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# below this size the structure of a file is not checked with ijson
+# before parsing it with json, the full parse fails just as fast
+STREAMING_THRESHOLD = 256 * 1024
+
+# below this size mapping the file costs more than reading it
+MMAP_THRESHOLD = 64 * 1024
+
+# string values up to this length are interned, longer ones deduplicated
+INTERN_MAX_LENGTH = 64
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError
+JSON_ERRORS = (json.JSONDecodeError,)
+if ijson is not None:
+    JSON_ERRORS += (ijson.JSONError,)
+
+SCHEMA_PATH = Path(__file__).parent / "schemas" / "investigation.schema.json"
+CACHE_DIR = Path(
+    os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+) / "omero-isa"
+AGENT_SOCKET = CACHE_DIR / "agent.sock"
+PARSE_CACHE_DIR = CACHE_DIR / "parsed"
+# number of validated investigations kept in the parse cache, the least
+# recently used are removed; 0 disables the cache
+PARSE_CACHE_ENTRIES = int(os.environ.get("ISA_PARSE_CACHE_ENTRIES", 8))
+
+# chunk size for hashing and pre-flight reads of investigation files; the
+# default sizes (8 KiB for read loops, 64 KiB for ijson) mean many syscalls
+# for large files. json.load reads the whole file in one call anyway.
+READ_CHUNK_SIZE = 1024 * 1024
+
+DEFAULT_PORT = 4064
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+# OMERO's default port for unencrypted Glacier2 connections
+LOCAL_TCP_PORT = 4063
+# log in to local servers through LOCAL_TCP_PORT unless ISA_LOCAL_FASTPATH=0
+LOCAL_FASTPATH = os.environ.get("ISA_LOCAL_FASTPATH", "1") != "0"
+# seconds to wait for the unencrypted endpoint to accept a connection
+LOCAL_PROBE_TIMEOUT = 0.5
+
+# number of investigation files parsed ahead of the import in --batch mode
+BATCH_PARSE_AHEAD = 2
+
+# argument parser built on the first main() call and reused afterwards
+_PARSER = None
+
+# message prefix and exit code for errors reported by main()
+_EXIT = {
+    FileNotFoundError: ("Error", 1),
+    ValueError: ("Validation Error", 1),
+    ConnectionError: ("Connection Error", 1),
+    RuntimeError: ("Import Error", 1),
+    KeyboardInterrupt: ("Import cancelled by user", 1),
+}
+
+# exceptions an agent may report back, re-raised on the client side
+_AGENT_ERRORS = {
+    "FileNotFoundError": FileNotFoundError,
+    "ValueError": ValueError,
+    "ConnectionError": ConnectionError,
+    "RuntimeError": RuntimeError,
+}
+
+# compiled schema validator, see schema_validator
+_VALIDATOR = None
+_VALIDATOR_LOCK = threading.Lock()
 
 
 def create_argument_parser():
@@ -16,49 +104,133 @@ def create_argument_parser():
 Examples:
   omero-isa -u admin -w password -s localhost "My Project" /path/to/i_investigation.json
   omero-isa -u admin -w password -s omero.company.com -p 4064 "My Project" /path/to/i_investigation.json
+  omero-isa -u admin -w password -s localhost --batch manifest.json
+  omero-isa --daemon
         """
     )
 
+    # positionals and credentials are required unless --daemon is given,
+    # which is checked in main()
     parser.add_argument(
         "project_name",
         type=str,
+        nargs="?",
         help="Name of the project to create in OMERO"
     )
 
     parser.add_argument(
         "investigation_file",
         type=str,
+        nargs="?",
         help="Path to the i_investigation.json file"
     )
 
     parser.add_argument(
         "-u", "--username",
-        required=True,
         help="OMERO username"
     )
 
     parser.add_argument(
         "-w", "--password",
-        required=True,
         help="OMERO password"
     )
 
     parser.add_argument(
         "-s", "--server",
-        required=True,
         help="OMERO server hostname"
     )
 
     parser.add_argument(
         "-p", "--port",
         type=int,
-        default=4064,
+        default=DEFAULT_PORT,
         help="OMERO server port (default: 4064)"
     )
 
+    parser.add_argument(
+        "--batch",
+        metavar="MANIFEST",
+        help=(
+            "JSON file listing investigations to import over a single "
+            "connection: [{\"project_name\": ..., \"investigation_file\": ...}]"
+        )
+    )
+
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Print the parsed investigation data before importing"
+    )
+
+    parser.add_argument(
+        "--no-local-fastpath",
+        action="store_true",
+        help=(
+            "Always log in through the SSL endpoint. By default, a server "
+            "on localhost with the default port is reached through its "
+            "unencrypted endpoint on port 4063, which saves the TLS "
+            "handshake but sends the password in plain text over the "
+            "loopback interface (also set by ISA_LOCAL_FASTPATH=0)"
+        )
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Run an agent that keeps OMERO connections open for "
+            "subsequent omero-isa calls"
+        )
+    )
+
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"%(prog)s {package_version()}"
+    )
+
     return parser
 
 
+def package_version():
+    """Return the installed version of omero-isa."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("omero-isa")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def check_import_arguments(parser, args):
+    """Exit with a usage error if arguments needed for an import are missing."""
+    if args.batch is not None:
+        if args.project_name is not None or args.investigation_file is not None:
+            parser.error(
+                "--batch cannot be combined with project_name and "
+                "investigation_file"
+            )
+        positionals = ()
+    else:
+        positionals = (
+            ("project_name", args.project_name),
+            ("investigation_file", args.investigation_file),
+        )
+
+    missing = [
+        name for name, value in positionals + (
+            ("-u/--username", args.username),
+            ("-w/--password", args.password),
+            ("-s/--server", args.server),
+        )
+        if value is None
+    ]
+    if missing:
+        parser.error(
+            "the following arguments are required: " + ", ".join(missing)
+        )
+
+
 def validate_investigation_file(file_path):
     """Validate that the investigation file exists and is valid JSON."""
     path = Path(file_path)
@@ -66,19 +238,338 @@ def validate_investigation_file(file_path):
     if not path.exists():
         raise FileNotFoundError(f"Investigation file not found: {file_path}")
 
-    if not path.suffix.lower() == ".json":
-        raise ValueError(f"File must be a JSON file, got: {path.suffix}")
-
+    if path.is_file():
+        with open(path, "rb") as f:
+            check_json_start(f.read(64), file_path)
+
+        digest = None
+        if PARSE_CACHE_ENTRIES > 0:
+            digest = investigation_digest(path)
+            data = load_cached_investigation(digest)
+            if data is not None:
+                return path, data
+
+        try:
+            # without orjson, fail fast on structurally broken large files
+            # before paying for the slow full parse; with it, the second
+            # pass would cost more than it saves, and the schema checks
+            # the studies as well
+            if orjson is None and os.stat(path).st_size >= STREAMING_THRESHOLD:
+                preflight_investigation(path)
+            data = load_investigation(path)
+        except JSON_ERRORS as e:
+            raise ValueError(f"Invalid JSON in file {file_path}: {e}")
+    else:
+        # pipes and process substitutions can be read only once,
+        # so they are neither cached nor streamed
+        digest = None
+        buf = path.read_bytes()
+        check_json_start(buf[:64], file_path)
+        try:
+            data = orjson.loads(buf) if orjson is not None else json.loads(buf)
+        except JSON_ERRORS as e:
+            raise ValueError(f"Invalid JSON in file {file_path}: {e}")
+
+    validator = schema_validator()
+    if validator is not None:
+        try:
+            validator(data)
+        except fastjsonschema.JsonSchemaException as e:
+            raise ValueError(
+                f"Invalid investigation in file {file_path}: {e.message}"
+            )
+    data = intern_tree(data)
+    if digest is not None:
+        store_cached_investigation(digest, data)
+    return path, data
+
+
+def check_json_start(head, file_path):
+    """Check that the first bytes of a file can start a JSON document.
+
+    Args:
+        head (bytes): The first bytes of the file.
+        file_path (str or Path): Path of the file, used in the error message.
+
+    Raises:
+        ValueError: If the first non-whitespace byte is not "{" or "[".
+    """
+    head = head.lstrip(b" \t\r\n")
+    if head and head[:1] not in (b"{", b"["):
+        raise ValueError(f"File does not contain JSON: {file_path}")
+
+
+def investigation_digest(path):
+    """Hash an investigation file for the parse cache.
+
+    The schema is hashed along with the file, so cache entries validated
+    against an older schema are not reused.
+
+    Args:
+        path (Path): Path to the i_investigation.json file.
+
+    Returns:
+        str: Hex digest of schema and file content.
+    """
+    h = hashlib.blake2b(SCHEMA_PATH.read_bytes())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_cached_investigation(digest):
+    """Return validated investigation data from the cache.
+
+    Entries are plain JSON, so a tampered cache file can at worst yield
+    wrong data, never run code. Skips the pre-flight check and the schema
+    validation of a file that was validated before.
+
+    Args:
+        digest (str): Digest returned by investigation_digest().
+
+    Returns:
+        dict or None: The cached data, or None on a cache miss.
+    """
+    cache_file = PARSE_CACHE_DIR / f"{digest}.json"
+    try:
+        buf = cache_file.read_bytes()
+        data = orjson.loads(buf) if orjson is not None else json.loads(buf)
+    except (OSError,) + JSON_ERRORS:
+        # missing, unreadable or truncated entry: parse the file again
+        return None
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
-        return path, data
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON in file {file_path}: {e}")
+        # most recently used entries are kept, see prune_investigation_cache
+        os.utime(cache_file)
+    except OSError:
+        pass
+    return intern_tree(data)
+
+
+def store_cached_investigation(digest, data):
+    """Store parsed and validated investigation data in the cache.
+
+    Failing to write the cache is not an error, the file is parsed
+    again next time. Only the PARSE_CACHE_ENTRIES most recently used
+    entries are kept.
+
+    Args:
+        digest (str): Digest returned by investigation_digest().
+        data (dict): The parsed investigation data.
+    """
+    cache_file = PARSE_CACHE_DIR / f"{digest}.json"
+    tmp_file = cache_file.with_suffix(
+        f".{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+        with open(tmp_file, "wb") as f:
+            if orjson is not None:
+                f.write(orjson.dumps(data))
+            else:
+                f.write(json.dumps(data, separators=(",", ":")).encode())
+        # rename is atomic, concurrent runs never see a partial entry
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+        return
+    prune_investigation_cache(PARSE_CACHE_ENTRIES)
+
+
+def prune_investigation_cache(max_entries):
+    """Remove all but the most recently used entries of the parse cache.
+
+    Args:
+        max_entries (int): Number of entries to keep.
+    """
+    try:
+        with os.scandir(PARSE_CACHE_DIR) as entries:
+            cached = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in entries if entry.name.endswith(".json")
+            ]
+    except OSError:
+        return
+    cached.sort(reverse=True)
+    for _, path in cached[max_entries:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            # removed by a concurrent run
+            pass
+
+
+def intern_tree(obj):
+    """Share repeated strings in parsed JSON data.
+
+    ISA JSON repeats the same keys and many of the same values (ontology
+    terms, namespaces, data file types) across thousands of records. All
+    dict keys and short string values are interned; longer string values
+    are deduplicated within the tree, so equal strings end up as one object.
+
+    Args:
+        obj (dict or list): Parsed JSON data.
+
+    Returns:
+        dict or list: Equal data with shared string objects.
+    """
+    seen = {}
+
+    def _walk(node):
+        if isinstance(node, dict):
+            return {sys.intern(k): _walk(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [_walk(v) for v in node]
+        if isinstance(node, str):
+            if len(node) <= INTERN_MAX_LENGTH:
+                return sys.intern(node)
+            return seen.setdefault(node, node)
+        return node
+
+    return _walk(obj)
+
+
+def preflight_investigation(path):
+    """Check the overall structure of an investigation file without parsing it.
+
+    Walks the ijson event stream only as far as needed to confirm that the
+    file contains a JSON object with a "studies" list holding exactly one
+    study object, which is what IsaInvestigationImporter requires. No Python
+    objects are built for the content of the file. Only worth its extra
+    pass over the file if orjson is not installed, see
+    validate_investigation_file. Does nothing if ijson is not installed.
+
+    Args:
+        path (Path): Path to the i_investigation.json file.
+
+    Raises:
+        ValueError: If the structure of the investigation is invalid.
+    """
+    if ijson is None:
+        return
+
+    n_studies = None
+    with open(path, "rb") as f:
+        events = ijson.parse(f, buf_size=READ_CHUNK_SIZE)
+        _, event, _ = next(events)
+        if event != "start_map":
+            raise ValueError(f"Investigation in {path} must be a JSON object")
+
+        for prefix, event, _ in events:
+            if prefix == "studies":
+                if event == "start_array":
+                    n_studies = 0
+                    continue
+                if event == "end_array":
+                    break
+                raise ValueError(f"'studies' in {path} must be a list")
+            if prefix == "studies.item" and event not in ("map_key", "end_map"):
+                if event != "start_map":
+                    raise ValueError(f"Studies in {path} must be JSON objects")
+                n_studies += 1
+                if n_studies > 1:
+                    break
+
+    if n_studies is None:
+        raise ValueError(f"Investigation in {path} contains no 'studies'")
+    if n_studies != 1:
+        raise ValueError(
+            f"Investigation in {path} must contain exactly one study"
+        )
+
+
+def schema_validator():
+    """Return the compiled validator for the investigation JSON schema.
+
+    The schema is loaded and compiled with fastjsonschema on the first
+    call only; later calls, e.g. for the files of a batch, reuse the
+    validator.
+
+    Returns:
+        callable or None: The validation function, or None if
+            fastjsonschema is not installed.
+    """
+    global _VALIDATOR
+    if fastjsonschema is None:
+        return None
+
+    with _VALIDATOR_LOCK:
+        if _VALIDATOR is None:
+            schema = json.loads(SCHEMA_PATH.read_bytes())
+            _VALIDATOR = fastjsonschema.compile(schema)
+        return _VALIDATOR
+
+
+def load_investigation(path):
+    """Load an investigation JSON file.
+
+    Parsed in one go with orjson if it is installed, directly from a
+    memory map for all but small files, so the raw file content is not
+    copied into memory next to the parsed tree. Otherwise parsed with json.
+
+    Args:
+        path (Path): Path to the i_investigation.json file.
+
+    Returns:
+        dict: The parsed investigation data.
+    """
+    path = Path(path)
+    if orjson is not None:
+        if os.stat(path).st_size < MMAP_THRESHOLD:
+            return orjson.loads(path.read_bytes())
+        return _loads_mmap(path)
 
+    with open(path, "rb") as f:
+        return json.load(f)
+
+
+def _loads_mmap(path):
+    """Parse a JSON file with orjson directly from a read-only memory map."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        with memoryview(mm) as buf:
+            return orjson.loads(buf)
+    finally:
+        mm.close()
+
+
+def connect_to_omero(username, password, server, port, local_fastpath=None):
+    """Establish connection to OMERO server using BlitzGateway.
+
+    Args:
+        username (str): OMERO username.
+        password (str): OMERO password.
+        server (str): OMERO server hostname.
+        port (int): OMERO server port.
+        local_fastpath (bool, optional): Try the unencrypted endpoint of a
+            local server first, see connect_to_local_omero. Defaults to
+            None (LOCAL_FASTPATH).
+
+    Returns:
+        omero.gateway.BlitzGateway: The connected gateway.
+
+    Raises:
+        ConnectionError: If the server cannot be reached or the login is
+            rejected.
+    """
+    # imported here so that --help and file validation errors
+    # do not pay for loading the Ice runtime
+    from omero.gateway import BlitzGateway
+
+    if local_fastpath is None:
+        local_fastpath = LOCAL_FASTPATH
+    if local_fastpath and server in LOCAL_HOSTS and port == DEFAULT_PORT:
+        conn = connect_to_local_omero(username, password)
+        if conn is not None:
+            reporter.info(
+                f"✓ Successfully connected to OMERO at {server}:{LOCAL_TCP_PORT}"
+            )
+            return conn
 
-def connect_to_omero(username, password, server, port):
-    """Establish connection to OMERO server using BlitzGateway."""
     try:
         conn = BlitzGateway(
             username,
@@ -88,7 +579,7 @@ def connect_to_omero(username, password, server, port):
         )
 
         if conn.connect():
-            print(f"✓ Successfully connected to OMERO at {server}:{port}")
+            reporter.info(f"✓ Successfully connected to OMERO at {server}:{port}")
             return conn
         else:
             raise ConnectionError(f"Failed to connect to OMERO at {server}:{port}")
@@ -96,10 +587,128 @@ def connect_to_omero(username, password, server, port):
         raise ConnectionError(f"Connection error: {e}")
 
 
+def connect_to_local_omero(username, password):
+    """Connect to an OMERO server on this host without TLS.
+
+    Logging in through the default SSL router costs a TLS handshake,
+    which dominates short runs against a local development server. This
+    connects through the unencrypted Glacier2 endpoint instead, which
+    OMERO serves on port 4063 by default. Credentials are then sent
+    unencrypted over the loopback interface only; pass --no-local-fastpath
+    or set ISA_LOCAL_FASTPATH=0 to avoid this.
+
+    Args:
+        username (str): OMERO username.
+        password (str): OMERO password.
+
+    Returns:
+        omero.gateway.BlitzGateway or None: The connected gateway, or None
+            if the TCP endpoint is not available, in which case the caller
+            falls back to the regular connection.
+
+    Raises:
+        ConnectionError: If the endpoint is available but the login is
+            rejected. The credentials are not sent a second time.
+    """
+    from omero.gateway import BlitzGateway
+
+    # only fall back if nothing listens on the endpoint
+    try:
+        socket.create_connection(
+            ("127.0.0.1", LOCAL_TCP_PORT), timeout=LOCAL_PROBE_TIMEOUT
+        ).close()
+    except OSError:
+        return None
+
+    ice_config = CACHE_DIR / "local_tcp.config"
+    router = (
+        f"Ice.Default.Router=OMERO.Glacier2/router:tcp "
+        f"-p {LOCAL_TCP_PORT} -h 127.0.0.1\n"
+    )
+    try:
+        if not ice_config.exists() or ice_config.read_text() != router:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            ice_config.write_text(router)
+    except OSError:
+        return None
+
+    conn = BlitzGateway(
+        username,
+        password,
+        host="127.0.0.1",
+        port=LOCAL_TCP_PORT,
+        extra_config=[str(ice_config)],
+        secure=False
+    )
+    try:
+        connected = conn.connect()
+    except Exception:
+        # the endpoint is not a Glacier2 router
+        conn.close()
+        return None
+    if not connected:
+        conn.close()
+        raise ConnectionError(
+            f"Failed to connect to OMERO at 127.0.0.1:{LOCAL_TCP_PORT}"
+        )
+    return conn
+
+
+class Reporter:
+    """Collects status lines and writes them to stdout in one call per stage.
+
+    Lines passed to info() are buffered until flush() is called at the end
+    of a stage, so each stage costs a single write (and, on a terminal, a
+    single flush) instead of one per line.
+    """
+
+    def __init__(self):
+        """Initialize the Reporter."""
+        self._lines = []
+
+    def info(self, message):
+        """Queue a status line."""
+        self._lines.append(message)
+
+    def flush(self):
+        """Write all queued status lines to stdout."""
+        if not self._lines:
+            return
+        lines, self._lines = self._lines, []
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+
+reporter = Reporter()
+
+
+def _fmt(obj):
+    """Format parsed JSON data for printing."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, default=str, indent=2)
+
+
+def close_when_connected(connecting):
+    """Close the connection of a pending connect once it is established.
+
+    Args:
+        connecting (concurrent.futures.Future): Future of a
+            connect_to_omero call.
+    """
+    try:
+        conn = connecting.result()
+    except Exception:
+        return
+    conn.close()
+
+
 def import_arc_repository(conn, investigation_path, investigation_data, project_name):
     """Import the ARC repository into OMERO."""
+    from omero_isa.isa_investigation_importer import IsaInvestigationImporter
+
     try:
-        print(f"✓ Loading investigation file: {investigation_path}")
+        reporter.info(f"✓ Loading investigation file: {investigation_path}")
 
         # Create importer instance
         importer = IsaInvestigationImporter(
@@ -109,38 +718,250 @@ def import_arc_repository(conn, investigation_path, investigation_data, project_
         )
 
         # Import the investigation
-        print("▸ Importing ARC repository...")
+        reporter.info("▸ Importing ARC repository...")
+        reporter.flush()
         project = importer.save(conn)
 
-        print(f"✓ Successfully imported ARC repository")
-        print(f"  Project ID: {project.id}")
-        print(f"  Project name: {project.name}")
+        reporter.info("✓ Successfully imported ARC repository")
+        reporter.info(f"  Project ID: {project.id}")
+        reporter.info(f"  Project name: {project.name}")
+        reporter.flush()
 
         return project
     except Exception as e:
         raise RuntimeError(f"Failed to import ARC repository: {e}")
 
 
-def main():
-    """Main entry point for the omero-isa CLI."""
-    parser = create_argument_parser()
-    args = parser.parse_args()
+def local_fastpath(args):
+    """Return whether local servers may be reached without TLS."""
+    return LOCAL_FASTPATH and not args.no_local_fastpath
+
+
+def import_via_agent(args):
+    """Hand the import over to a running omero-isa agent.
+
+    Args:
+        args (argparse.Namespace): Parsed CLI arguments.
+
+    Returns:
+        bool: True if an agent performed the import, False if no agent
+            is running.
+
+    Raises:
+        Exception: The exception type reported by the agent if the
+            import failed there.
+    """
+    from omero_isa.agent import request_import
+
+    # the agent cannot read pipes opened by this process
+    if not Path(args.investigation_file).is_file():
+        return False
+    # the agent connects on its own terms, see --daemon --no-local-fastpath
+    if args.no_local_fastpath:
+        return False
+
+    response = request_import(AGENT_SOCKET, {
+        "username": args.username,
+        "password": args.password,
+        "server": args.server,
+        "port": args.port,
+        "project_name": args.project_name,
+        "investigation_file": str(Path(args.investigation_file).resolve()),
+    })
+    if response is None:
+        return False
+
+    if "error" in response:
+        raise _AGENT_ERRORS.get(response["error"], Exception)(
+            response["message"]
+        )
 
+    reporter.info("✓ Successfully imported ARC repository via agent")
+    reporter.info(f"  Project ID: {response['project_id']}")
+    reporter.info(f"  Project name: {response['project_name']}")
+    return True
+
+
+def import_batch(args):
+    """Import all investigations listed in a manifest over one connection.
+
+    The manifest is a JSON list of objects with the keys
+    "investigation_file" and, optionally, "project_name". Relative paths
+    are resolved against the directory of the manifest. A failing entry
+    is reported and skipped, so it does not abort the rest of the batch.
+
+    Args:
+        args (argparse.Namespace): Parsed CLI arguments.
+
+    Returns:
+        int: 0 if all investigations were imported, 1 otherwise.
+
+    Raises:
+        FileNotFoundError: If the manifest does not exist.
+        ValueError: If the manifest is not valid JSON or malformed.
+        ConnectionError: If the connection to OMERO fails.
+    """
+    manifest_path = Path(args.batch)
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Manifest file not found: {manifest_path}")
     try:
-        # Validate investigation file
-        print("▸ Validating investigation file...")
-        investigation_path, investigation_data = validate_investigation_file(
-            args.investigation_file
+        entries = load_investigation(manifest_path)
+    except JSON_ERRORS as e:
+        raise ValueError(f"Invalid JSON in file {manifest_path}: {e}")
+    if not isinstance(entries, list) or not all(
+        isinstance(entry, dict) and "investigation_file" in entry
+        for entry in entries
+    ):
+        raise ValueError(
+            f"Manifest {manifest_path} must be a list of objects with an "
+            "'investigation_file' key"
         )
 
-        # Connect to OMERO
-        print(f"▸ Connecting to OMERO at {args.server}:{args.port}...")
-        conn = connect_to_omero(
-            username=args.username,
-            password=args.password,
-            server=args.server,
-            port=args.port
+    reporter.info(f"▸ Connecting to OMERO at {args.server}:{args.port}...")
+    reporter.flush()
+    conn = connect_to_omero(
+        username=args.username,
+        password=args.password,
+        server=args.server,
+        port=args.port,
+        local_fastpath=local_fastpath(args),
+    )
+
+    file_paths = [
+        manifest_path.parent / entry["investigation_file"] for entry in entries
+    ]
+
+    # the next files are parsed in worker threads while the current one is
+    # imported; the bounded lookahead caps the number of parsed
+    # investigations held in memory
+    failed = 0
+    pending = deque()
+    executor = ThreadPoolExecutor(
+        max_workers=min(BATCH_PARSE_AHEAD, os.cpu_count() or 1)
+    )
+    try:
+        for file_path in file_paths[:BATCH_PARSE_AHEAD]:
+            pending.append(
+                executor.submit(validate_investigation_file, file_path)
+            )
+
+        for i, (entry, file_path) in enumerate(zip(entries, file_paths)):
+            parsing = pending.popleft()
+            if i + BATCH_PARSE_AHEAD < len(file_paths):
+                pending.append(executor.submit(
+                    validate_investigation_file,
+                    file_paths[i + BATCH_PARSE_AHEAD]
+                ))
+            try:
+                reporter.info(f"▸ Validating investigation file {file_path}...")
+                reporter.flush()
+                investigation_path, investigation_data = parsing.result()
+                if args.verbose:
+                    reporter.info(_fmt(investigation_data))
+                import_arc_repository(
+                    conn,
+                    investigation_path,
+                    investigation_data,
+                    entry.get("project_name", None)
+                )
+            except Exception as e:
+                failed += 1
+                reporter.flush()
+                print(f"✗ Error importing {file_path}: {e}", file=sys.stderr)
+    finally:
+        for parsing in pending:
+            parsing.cancel()
+        executor.shutdown()
+        conn.close()
+        reporter.info("✓ Connection closed")
+        reporter.flush()
+
+    if failed:
+        print(
+            f"\n✗ {failed} of {len(entries)} imports failed", file=sys.stderr
         )
+        return 1
+    reporter.info(f"\n✓ All {len(entries)} imports completed successfully!")
+    return 0
+
+
+def configure_logging():
+    """Write the progress messages of the importer to stdout.
+
+    Does nothing if the omero_isa logger already has handlers besides the
+    package's NullHandler, e.g. when main() is called repeatedly.
+    """
+    logger = logging.getLogger("omero_isa")
+    if any(not isinstance(h, logging.NullHandler) for h in logger.handlers):
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def main(argv=None):
+    """Main entry point for the omero-isa CLI."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # answer the common informational call without building the parser;
+    # --help is left to the parser, its layout depends on the Python version
+    if argv == ["--version"]:
+        print(f"omero-isa {package_version()}")
+        return 0
+
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = create_argument_parser()
+    parser = _PARSER
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    if args.daemon:
+        from omero_isa.agent import ConnectionPool, serve
+
+        serve(AGENT_SOCKET, ConnectionPool(functools.partial(
+            connect_to_omero, local_fastpath=local_fastpath(args)
+        )))
+        return 0
+
+    check_import_arguments(parser, args)
+
+    try:
+        if args.batch is not None:
+            return import_batch(args)
+
+        if import_via_agent(args):
+            reporter.info("\n✓ Import completed successfully!")
+            return 0
+
+        # Validate investigation file while connecting to OMERO; the
+        # connect handshake is network bound and needs no parsed data
+        reporter.info("▸ Validating investigation file...")
+        reporter.info(f"▸ Connecting to OMERO at {args.server}:{args.port}...")
+        reporter.flush()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            connecting = executor.submit(
+                connect_to_omero,
+                username=args.username,
+                password=args.password,
+                server=args.server,
+                port=args.port,
+                local_fastpath=local_fastpath(args),
+            )
+            try:
+                investigation_path, investigation_data = (
+                    validate_investigation_file(args.investigation_file)
+                )
+            except BaseException:
+                close_when_connected(connecting)
+                raise
+            conn = connecting.result()
+
+        if args.verbose:
+            reporter.info(_fmt(investigation_data))
+        reporter.flush()
 
         # Import ARC repository
         project = import_arc_repository(
@@ -152,28 +973,41 @@ def main():
 
         # Close connection
         conn.close()
-        print("✓ Connection closed")
-        print("\n✓ Import completed successfully!")
+        reporter.info("✓ Connection closed")
+        reporter.info("\n✓ Import completed successfully!")
         return 0
 
-    except FileNotFoundError as e:
-        print(f"✗ Error: {e}", file=sys.stderr)
-        return 1
-    except ValueError as e:
-        print(f"✗ Validation Error: {e}", file=sys.stderr)
-        return 1
-    except ConnectionError as e:
-        print(f"✗ Connection Error: {e}", file=sys.stderr)
-        return 1
-    except RuntimeError as e:
-        print(f"✗ Import Error: {e}", file=sys.stderr)
-        return 1
-    except KeyboardInterrupt:
-        print("\n✗ Import cancelled by user", file=sys.stderr)
-        return 1
-    except Exception as e:
-        print(f"✗ Unexpected error: {e}", file=sys.stderr)
-        return 1
+    except (Exception, KeyboardInterrupt) as e:
+        return report_error(e)
+    finally:
+        reporter.flush()
+
+
+def report_error(error):
+    """Print an error message for an exception raised in main().
+
+    Args:
+        error (BaseException): The exception to report.
+
+    Returns:
+        int: The exit code for the error.
+    """
+    # the most specific class in the table wins, so subclasses such as
+    # json.JSONDecodeError are reported like their base classes
+    for cls in type(error).__mro__:
+        if cls in _EXIT:
+            prefix, code = _EXIT[cls]
+            break
+    else:
+        prefix, code = "Unexpected error", 1
+
+    # status lines must appear before the error message
+    reporter.flush()
+    if isinstance(error, KeyboardInterrupt):
+        print(f"\n✗ {prefix}", file=sys.stderr)
+    else:
+        print(f"✗ {prefix}: {error}", file=sys.stderr)
+    return code
 
 
 if __name__ == "__main__":
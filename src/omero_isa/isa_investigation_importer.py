@@ -12,14 +12,20 @@ The import workflow follows this structure:
 - DataFile → OMERO Image
 
 Classes:
-    IsaInvestigationImporter: Main importer class for ISA investigations
+    IsaInvestigationImporter: Main importer class for ISA investigations,
+        from_path streams the assays from the investigation file
     ImageFactory: Factory for creating and importing images
     DatasetFactory: Factory for creating and importing datasets
     MappedAnnotationFactory: Factory for creating mapped annotations
+    AnnotationDataError: Raised for ISA data without a mapped annotation
 
 Functions:
-    import_and_tag_image: Import image file using OMERO CLI
+    import_and_tag_image: Import image file using the in-process OMERO CLI
     link: Link two OMERO objects together
+    create_link: Create an unsaved link between two OMERO objects
+    save_links: Save many links with a single server call
+    file_exists: Check for a file using cached directory listings
+    cached_file_size: Get the size of a file from cached directory listings
 
 Author:
     Christoph Möhl
@@ -29,15 +35,94 @@ Version:
 """
 from omero import rtypes, model
 from omero.model import ProjectI, MapAnnotationI, DatasetI, NamedValue, Annotation, ImageI
-import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from itertools import chain
+import json
+import logging
+import os
+from pathlib import Path
+import re
+import sys
+import tempfile
+import threading
 from omero_isa.roi import import_rois_from_json
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+logger = logging.getLogger(__name__)
+
+# ijson prefix of the assays of the (only) study
+ASSAYS_PREFIX = "studies.item.assays"
+
+# keys of an ISA ontology annotation, mapped to <key>_term* entries
+ONTOLOGY_ANNOTATION_KEYS = frozenset(
+    ("termAccession", "termSource", "annotationValue")
+)
+
+# suffixes of the mapping keys of an ontology annotation
+_TERM_SUFFIXES = ("_term", "_term_accession", "_term_source")
+
+# first image id in the summary written by "omero import --file"
+IMAGE_ID_PATTERN = re.compile(rb"^Image:(\d+)")
+
+# number of images imported concurrently
+IMPORT_WORKERS = int(os.environ.get("ISA_IMPORT_WORKERS", 4))
+
+# number of ROI files imported concurrently with the image imports
+ROI_WORKERS = 2
+
+# imports per import thread that may wait in the pool before no further
+# assays are read, so the assay data waiting for import stays bounded
+PENDING_IMPORTS_PER_WORKER = 4
+
+# maximum number of links saved per saveAndReturnArray call
+LINK_BATCH_SIZE = 64
+
+# OMERO CLI instances with loaded plugins, one per importing thread since
+# the CLI keeps per-invocation state
+_CLI = threading.local()
+
+
+class AnnotationDataError(ValueError, AssertionError):
+    """ISA data that does not hold a mapped annotation.
+
+    MappedAnnotationFactory used to check its data with assert statements,
+    so the error is also an AssertionError for callers catching that.
+    """
+
+
+def _omero_cli():
+    """Return the OMERO CLI instance of the current thread.
+
+    The instance is created on first use, so loading the CLI plugins is
+    done once per thread instead of starting a new ``omero`` interpreter
+    for every imported image.
+
+    Returns:
+        omero.cli.CLI: The CLI instance.
+    """
+    cli = getattr(_CLI, "cli", None)
+    if cli is None:
+        from omero.cli import CLI
+
+        cli = CLI()
+        cli.loadplugins()
+        _CLI.cli = cli
+    return cli
+
 
 def import_and_tag_image(conn, file_path, dataset_id, name, description):
     """Import and tag an image file into OMERO using the OMERO CLI.
 
     Uses the OMERO command-line interface to import an image file into a specified
     dataset. The import leverages the existing OMERO session to avoid re-authentication.
+    The CLI runs in-process; only the Java importer is started per image.
 
     Args:
         conn (omero.gateway.BlitzGateway): Active OMERO connection.
@@ -50,9 +135,6 @@ def import_and_tag_image(conn, file_path, dataset_id, name, description):
         omero.model.ImageI or None: The created Image object if successful,
             None if the import failed.
 
-    Raises:
-        subprocess.CalledProcessError: If the OMERO CLI command fails to execute.
-
     Examples:
         >>> conn = connect_to_omero('admin', 'password', 'localhost', 4064)
         >>> dataset_id = 123
@@ -69,39 +151,86 @@ def import_and_tag_image(conn, file_path, dataset_id, name, description):
     Note:
         - Uses session key (-k flag) for authentication, no password needed
         - Extracts image ID from CLI output (format: "Image:123")
-        - Prints progress and error messages to stdout/stderr
+        - Logs progress and error messages to the omero_isa logger
     """
-    # 1. Extract connection details from existing connection
-    host = conn.host
-    port = conn.port
-    session_id = conn.c.getSessionId()
-
-    # 2. Build CLI command using session key (no password needed!)
-    cmd = [
-        "omero", "import", file_path,
-        "-s", str(host),
-        "-p", str(port),
-        "-k", str(session_id),
-        "-d", str(dataset_id),
-        "--name", name,
-        "--description", description
-    ]
-
-    # 3. Execute import command
-    print(f"Start importing: {name}...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode == 0:
-        print(f"Success: File was imported as '{name}'.")
-        # Extract image ID from CLI output (e.g., "Image:123")
-        for line in result.stdout.splitlines():
-            if line.startswith("Image:"):
-                image_id = int(line.split(":")[1].split(",")[0])
-                return conn.getObject("Image", image_id)
-    else:
-        print("Import error:")
-        print(result.stderr)
+    image_id = _import_image(
+        _import_session(conn), file_path, dataset_id, name, description
+    )
+    if image_id is None:
         return None
+    return conn.getObject("Image", image_id)
+
+
+def _import_session(conn):
+    """Return the connection details the OMERO CLI imports with.
+
+    Read once in the thread owning the connection, since BlitzGateway is
+    not thread-safe.
+
+    Args:
+        conn (omero.gateway.BlitzGateway): Active OMERO connection.
+
+    Returns:
+        tuple: (host, port, session ID).
+    """
+    return conn.host, conn.port, conn.c.getSessionId()
+
+
+def _import_image(session, file_path, dataset_id, name, description):
+    """Import an image file with the in-process OMERO CLI.
+
+    Does not use the BlitzGateway, so it can run in any thread.
+
+    Args:
+        session (tuple): (host, port, session ID), see _import_session.
+        file_path (str or Path): Full path to the image file to import.
+        dataset_id (int): ID of the OMERO Dataset to import the image into.
+        name (str): Display name for the imported image in OMERO.
+        description (str): Description text for the imported image.
+
+    Returns:
+        int or None: The ID of the created image, None if the import failed.
+    """
+    from omero.cli import NonZeroReturnCode
+
+    # 1. Connection details of the existing session
+    host, port, session_id = session
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        out_path = Path(tmp_dir) / "stdout.txt"
+        err_path = Path(tmp_dir) / "stderr.txt"
+
+        # 2. Build CLI command using session key (no password needed!)
+        cmd = [
+            "import", str(file_path),
+            "-s", str(host),
+            "-p", str(port),
+            "-k", str(session_id),
+            "-d", str(dataset_id),
+            "--name", name,
+            "--description", description,
+            "--file", str(out_path),
+            "--errs", str(err_path),
+        ]
+
+        # 3. Execute import command
+        logger.info("Start importing: %s...", name)
+        try:
+            _omero_cli().invoke(cmd, strict=True)
+        except NonZeroReturnCode:
+            errors = err_path.read_text() if err_path.exists() else ""
+            logger.error("Import error:\n%s", errors)
+            return None
+
+        logger.info("Success: File was imported as '%s'.", name)
+        # Extract image ID from CLI output (e.g., "Image:123"). The output
+        # file only holds the import summary, progress goes to the errs file
+        with open(out_path, "rb") as f:
+            for line in f:
+                match = IMAGE_ID_PATTERN.match(line)
+                if match:
+                    return int(match.group(1))
+    return None
 
 
 
@@ -121,7 +250,11 @@ class IsaInvestigationImporter:
         data (dict): The full ISA investigation JSON data.
         study_data (dict): The first (and only) study in the investigation.
         assay_data (list or None): List of assays within the study, or None if empty.
+            Always None for importers created with from_path, which stream
+            the assays from the file instead.
         path_to_arc (Path): Path to the ARC (Annotated Research Context) directory.
+        max_workers (int): Number of images imported concurrently.
+        batch_size (int): Maximum number of links saved per server call.
 
     Examples:
         >>> from pathlib import Path
@@ -144,7 +277,8 @@ class IsaInvestigationImporter:
         - All image file paths are relative to the ARC root directory
     """
 
-    def __init__(self, data, path_to_arc, project_name=None):
+    def __init__(self, data, path_to_arc, project_name=None, max_workers=None,
+                 batch_size=LINK_BATCH_SIZE):
         """Initialize the ISA investigation importer.
 
         Args:
@@ -152,6 +286,11 @@ class IsaInvestigationImporter:
             path_to_arc (Path): Path to the ARC root directory containing image files.
             project_name (str, optional): Custom name for the OMERO project.
                 If None, defaults to the study title. Defaults to None.
+            max_workers (int, optional): Number of images imported
+                concurrently. Defaults to IMPORT_WORKERS (set by the
+                ISA_IMPORT_WORKERS environment variable, default 4).
+            batch_size (int, optional): Maximum number of links saved per
+                server call. Defaults to LINK_BATCH_SIZE.
 
         Raises:
             AssertionError: If investigation doesn't contain exactly one study or
@@ -167,34 +306,178 @@ class IsaInvestigationImporter:
         self.study_data = data["studies"][0]
         self.assay_data = self.study_data.get("assays", None)
         self.path_to_arc = path_to_arc
+        self.max_workers = IMPORT_WORKERS if max_workers is None else max_workers
+        self.batch_size = batch_size
+        # annotation links waiting to be saved in one call
+        self._pending = []
+        # investigation file the assays are streamed from, see from_path
+        self._assay_path = None
+        # directory listings of the ARC, shared by all factories
+        self._arc_files = {}
+
+    @classmethod
+    def from_path(cls, path_to_investigation_json, path_to_arc=None,
+                  project_name=None, **kwargs):
+        """Create an importer that streams the assays from the JSON file.
+
+        The investigation is parsed without the assays of its study, which
+        hold the dataFiles and make up most of large investigations. On
+        save, the assays are read from the file one at a time. Besides the
+        current assay, memory only holds the data of image imports still
+        waiting for an import thread; before the next assay is read, these
+        are reduced to PENDING_IMPORTS_PER_WORKER * max_workers, see
+        _add_datasets. Falls back to loading the whole file if ijson is not
+        installed.
+
+        Args:
+            path_to_investigation_json (str or Path): Path to the ISA
+                investigation JSON file.
+            path_to_arc (Path, optional): Path to the ARC root directory.
+                Defaults to the directory of the investigation file.
+            project_name (str, optional): Custom name for the OMERO project.
+                Defaults to None.
+            **kwargs: max_workers and batch_size, see __init__.
+
+        Returns:
+            IsaInvestigationImporter: The importer.
+
+        Raises:
+            AssertionError: If investigation doesn't contain exactly one study.
+
+        Examples:
+            >>> importer = IsaInvestigationImporter.from_path(
+            ...     "/path/to/i_investigation.json", project_name="My ISA Project"
+            ... )
+            >>> project = importer.save(conn)
+        """
+        path = Path(path_to_investigation_json)
+        if path_to_arc is None:
+            path_to_arc = path.parent
+
+        if ijson is None:
+            with open(path, "r") as f:
+                return cls(json.load(f), path_to_arc, project_name, **kwargs)
+
+        builder = ijson.ObjectBuilder()
+        with open(path, "rb") as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if (
+                    prefix == ASSAYS_PREFIX
+                    or prefix.startswith(ASSAYS_PREFIX + ".")
+                ):
+                    continue
+                builder.event(event, value)
+
+        importer = cls(builder.value, path_to_arc, project_name, **kwargs)
+        importer._assay_path = path
+        return importer
+
+    def _iter_assays(self):
+        """Yield the assays of the study.
+
+        Yields:
+            dict: One assay at a time, read from the investigation file for
+                importers created with from_path.
+        """
+        if self._assay_path is None:
+            yield from self.assay_data or ()
+            return
+        with open(self._assay_path, "rb") as f:
+            yield from ijson.items(f, ASSAYS_PREFIX + ".item", use_float=True)
 
-    def _add_datasets(self, parent_object, conn):
+    def _add_datasets(self, parent_object, conn, update=None):
         """Add OMERO datasets (created from ISA assays) to the project.
 
         Creates a Dataset for each assay in the study and links them to the parent
         project object. Each dataset will include all associated images and metadata.
 
+        The images of all assays are imported by one pool of max_workers
+        threads. Datasets and their annotations are created while the images
+        of earlier assays are still being imported. ROIs are imported by a
+        second, small pool, so an import thread moves on to the next image
+        as soon as its image is on the server. The import threads only run
+        the OMERO CLI; the BlitzGateway is used in the calling thread only.
+
+        Once more than PENDING_IMPORTS_PER_WORKER * max_workers imports are
+        pending, the oldest ones are waited for before the next assay is
+        read. Only the futures of the imports are kept, not their data.
+
         Args:
             parent_object (omero.model.ProjectI): The parent OMERO project object.
             conn (omero.gateway.BlitzGateway): Active OMERO connection.
+            update (omero.api.IUpdatePrx, optional): Update service to use.
+                Defaults to conn.getUpdateService().
 
         Returns:
             None
 
+        Raises:
+            Exception: The first exception raised by an image import, after
+                all imports have finished.
+
         Note:
-            - Skips processing if no assays are present (assay_data is None)
+            - Skips processing if no assays are present
             - Each assay creates one dataset via DatasetFactory
         """
-        if self.assay_data is not None:
-            for assay_item in self.assay_data:
-                dataset = DatasetFactory(assay_item, self.path_to_arc)
-                dataset.save(conn, parent_object)
+        max_pending = PENDING_IMPORTS_PER_WORKER * self.max_workers
+        pending = deque()
+        roi_futures = []
+        errors = []
+        # the gateway is only used in this thread, the ROI threads save
+        # through a raw update service proxy, which is thread-safe
+        roi_update = conn.c.sf.getUpdateService()
+
+        def _finish(future):
+            try:
+                image_id, roidata_filepath = future.result()
+            except Exception as e:
+                errors.append(e)
+                return
+            if image_id is not None and roidata_filepath is not None:
+                roi_futures.append(roi_executor.submit(
+                    import_rois_from_json,
+                    roidata_filepath,
+                    ImageI(image_id, False),
+                    conn,
+                    update=roi_update,
+                ))
+
+        # the ROI pool is shut down last, ROI imports are submitted to it
+        # until all image imports are finished
+        with ThreadPoolExecutor(max_workers=ROI_WORKERS) as roi_executor, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for assay_item in self._iter_assays():
+                dataset = DatasetFactory(
+                    assay_item,
+                    self.path_to_arc,
+                    arc_files=self._arc_files,
+                    batch_size=self.batch_size,
+                )
+                dataset.save(
+                    conn,
+                    parent_object,
+                    update=update,
+                    executor=executor,
+                )
+                pending.extend(dataset.futures)
+                # the assay is not needed while waiting for its imports
+                del dataset, assay_item
+                while len(pending) > max_pending:
+                    _finish(pending.popleft())
+            while pending:
+                _finish(pending.popleft())
+
+        if errors:
+            raise errors[0]
+        for roi_future in roi_futures:
+            roi_future.result()
 
     def _add_mapped_annotations(self, parent_object, conn):
         """Add all mapped annotations from investigation and study data.
 
-        Extracts and creates mapped annotations from various levels of the ISA
-        investigation hierarchy:
+        Extracts mapped annotations from various levels of the ISA
+        investigation hierarchy and queues their links to the parent object
+        in self._pending, to be saved in a single call:
         - Investigation-level annotations
         - Study-level annotations
         - Nested list and dict annotations
@@ -209,47 +492,16 @@ class IsaInvestigationImporter:
         Note:
             - Silently skips data that doesn't contain annotation metadata
             - Processes both dict and list type data structures
-            - Handles AssertionErrors gracefully during annotation creation
         """
-        try:
-            maf = MappedAnnotationFactory(self.data)
-            maf.save(conn, parent_object=parent_object)
-        except AssertionError:
-            pass
-
-        for k in self.data.keys():
-            d = self.data[k]
-            if isinstance(d, list):
-                for e in d:
-                    try:
-                        maf = MappedAnnotationFactory(e)
-                        maf.save(conn, parent_object=parent_object)
-                    except AssertionError:
-                        pass
-            else:
-                try:
-                    maf = MappedAnnotationFactory(self.data[k])
-                    maf.save(conn, parent_object=parent_object)
-                except AssertionError:
-                    pass
-
-        for k in self.study_data.keys():
-            if k == "assays":
-                continue
-            study_data_item = self.study_data[k]
-            if isinstance(study_data_item, dict):
-                try:
-                    maf = MappedAnnotationFactory(self.study_data[k])
-                    maf.save(conn, parent_object=parent_object)
-                except AssertionError:
-                    pass
-            elif isinstance(study_data_item, list):
-                for item in study_data_item:
-                    try:
-                        maf = MappedAnnotationFactory(item)
-                        maf.save(conn, parent_object=parent_object)
-                    except AssertionError:
-                        pass
+        candidates = chain(
+            (self.data,),
+            _iter_candidates(self.data),
+            _iter_candidates(self.study_data, exclude=("assays",)),
+        )
+        for candidate in candidates:
+            if MappedAnnotationFactory.is_annotatable(candidate):
+                maf = MappedAnnotationFactory(candidate, validate=False)
+                self._pending.append(maf.create_link(parent_object))
 
 
 
@@ -281,10 +533,16 @@ class IsaInvestigationImporter:
         project.setName(rtypes.rstring(self.project_name))
         project.setDescription(rtypes.rstring(project_description))
 
+        # one update service proxy is used for all saves of this import
+        update = conn.getUpdateService()
+
         # Save the project to the server
-        project = conn.getUpdateService().saveAndReturnObject(project)
+        project = update.saveAndReturnObject(project)
         self._add_mapped_annotations(project, conn)
-        self._add_datasets(project, conn)
+        save_links(
+            self._pending, conn, update=update, batch_size=self.batch_size
+        )
+        self._add_datasets(project, conn, update=update)
         return project
 
 
@@ -317,12 +575,15 @@ class ImageFactory:
         ValueError: If image file path is invalid or file doesn't exist.
     """
 
-    def __init__(self, data, path_to_arc):
+    def __init__(self, data, path_to_arc, arc_files=None):
         """Initialize the ImageFactory.
 
         Args:
             data (dict): ISA data structure containing image metadata and filename.
             path_to_arc (Path): Path to the ARC root directory.
+            arc_files (dict, optional): Cache of directory listings used to
+                check that files exist, see file_exists. Defaults to a new,
+                empty cache.
 
         Raises:
             AssertionError: If data is not a dictionary.
@@ -330,6 +591,21 @@ class ImageFactory:
         assert isinstance(data, dict)
         self.data = data
         self.path_to_arc = path_to_arc
+        self._arc_files = {} if arc_files is None else arc_files
+
+    def file_size(self):
+        """Return the size of the image file in bytes.
+
+        Returns:
+            int: The file size, or 0 if the data has no file name or the
+                file cannot be accessed (save reports these cases).
+        """
+        file_path = self.data.get("name")
+        if not file_path:
+            return 0
+        # the listing is cached, so the images of a folder cost one scandir
+        size = cached_file_size(self.path_to_arc.parent / file_path, self._arc_files)
+        return 0 if size is None else size
 
     def save(self, conn, parent_object=None):
         """Save and import an image file into OMERO.
@@ -354,16 +630,37 @@ class ImageFactory:
             - Supported metadata: name, description, roidata_filename
             - ROI data is optional but will be imported if present
         """
-        img_name = ""
-        img_description = ""
-        roidata_filename = None
-        for comment in self.data["comments"]:
-            if comment["name"] == "name":
-                img_name = comment["value"]
-            elif comment["name"] == "description":
-                img_description = comment["value"]
-            elif comment["name"] == "roidata_filename":
-                roidata_filename = comment["value"]
+        image_id, roidata_filepath = self.import_image(
+            _import_session(conn), parent_object.getId()._val
+        )
+        image = None if image_id is None else conn.getObject("Image", image_id)
+        if image is not None and roidata_filepath is not None:
+            import_rois_from_json(roidata_filepath, image, conn)
+        return image
+
+    def import_image(self, session, dataset_id):
+        """Import the image file, without its ROIs.
+
+        Does not use the BlitzGateway, so it can run in an import thread;
+        the ROIs are imported by the caller, see save.
+
+        Args:
+            session (tuple): (host, port, session ID) of the connection, see
+                _import_session.
+            dataset_id (int): ID of the dataset to import the image into.
+
+        Returns:
+            tuple: (ID of the imported image or None if the import failed,
+                path of the ROI file or None if the image has no ROIs).
+
+        Raises:
+            ValueError: If 'name' key is missing from data.
+            AssertionError: If image file or ROI file doesn't exist.
+        """
+        comments = _comments_to_dict(self.data)
+        img_name = comments.get("name", "")
+        img_description = comments.get("description", "")
+        roidata_filename = comments.get("roidata_filename")
 
         # Ensure the file path exists in the data
         file_path = self.data.get("name")
@@ -371,29 +668,20 @@ class ImageFactory:
             raise ValueError("The 'name' key must be present in the data and point to a valid file path.")
 
         image_filepath = self.path_to_arc.parent / file_path
-        assert image_filepath.exists(), image_filepath
+        assert file_exists(image_filepath, self._arc_files), image_filepath
 
         # Upload the image file to OMERO
-        image = import_and_tag_image(
-            conn,
-            image_filepath,
-            parent_object.getId()._val,
-            img_name,
-            img_description,
+        image_id = _import_image(
+            session, image_filepath, dataset_id, img_name, img_description
         )
 
+        roidata_filepath = None
         if roidata_filename is not None:
             roidata_filepath = image_filepath.parent / roidata_filename
-            assert roidata_filepath.exists(), f"ROI file not found: {roidata_filepath}"
-
-            roi = import_rois_from_json(
-                roidata_filepath,
-                image,
-                conn
-            )
-
-
+            assert file_exists(roidata_filepath, self._arc_files), \
+                f"ROI file not found: {roidata_filepath}"
 
+        return image_id, roidata_filepath
 
 
 class DatasetFactory:
@@ -405,6 +693,10 @@ class DatasetFactory:
     Attributes:
         data (dict): The ISA assay data structure.
         path_to_arc (Path): Path to the ARC root directory.
+        futures (list): Futures of the image imports submitted to an external
+            executor by save, empty if save imported the images itself. The
+            result of each is the (image ID, ROI file path) tuple returned
+            by ImageFactory.import_image; the ROIs are left to the caller.
 
     Examples:
         >>> assay_data = {
@@ -421,12 +713,17 @@ class DatasetFactory:
         AssertionError: If data is not a dict or missing required fields.
     """
 
-    def __init__(self, data, path_to_arc):
+    def __init__(self, data, path_to_arc, arc_files=None, batch_size=None):
         """Initialize the DatasetFactory.
 
         Args:
             data (dict): ISA assay data structure.
             path_to_arc (Path): Path to the ARC root directory.
+            arc_files (dict, optional): Cache of directory listings passed on
+                to the image factories, see file_exists. Defaults to a new,
+                empty cache.
+            batch_size (int, optional): Maximum number of links saved per
+                server call. Defaults to None (all in one call).
 
         Raises:
             AssertionError: If data is not a dictionary.
@@ -434,9 +731,14 @@ class DatasetFactory:
         assert isinstance(data, dict)
         self.data = data
         self.path_to_arc = path_to_arc
+        self._arc_files = {} if arc_files is None else arc_files
+        self.batch_size = batch_size
+        self.futures = []
+        # annotation and project links waiting to be saved in one call
+        self._pending = []
 
     def _add_mapped_annotations(self, parent_object, conn):
-        """Add mapped annotations from assay data to the dataset.
+        """Queue links of mapped annotations from assay data to the dataset.
 
         Args:
             parent_object (omero.model.DatasetI): The parent dataset object.
@@ -445,52 +747,70 @@ class DatasetFactory:
         Returns:
             None
         """
-        try:
-            maf = MappedAnnotationFactory(self.data)
-            maf.save(conn, parent_object=parent_object)
-        except AssertionError:
-            pass
+        for candidate in chain((self.data,), _iter_candidates(self.data)):
+            if MappedAnnotationFactory.is_annotatable(candidate):
+                maf = MappedAnnotationFactory(candidate, validate=False)
+                self._pending.append(maf.create_link(parent_object))
 
-        for k in self.data.keys():
-            d = self.data[k]
-            if isinstance(d, list):
-                for e in d:
-                    try:
-                        maf = MappedAnnotationFactory(e)
-                        maf.save(conn, parent_object=parent_object)
-                    except AssertionError:
-                        pass
-            else:
-                try:
-                    maf = MappedAnnotationFactory(self.data[k])
-                    maf.save(conn, parent_object=parent_object)
-                except AssertionError:
-                    pass
-
-    def _add_images(self, parent_object, conn):
+    def _add_images(self, parent_object, conn, executor=None):
         """Add images from ISA data files to the dataset.
 
         Filters dataFiles to find images marked as 'Raw Image Data File' and
-        imports them into the dataset.
+        imports them into the dataset. Up to IMPORT_WORKERS images (set by
+        the ISA_IMPORT_WORKERS environment variable, default 4) are imported
+        concurrently, since each import mostly waits for the Java importer
+        and the server.
 
         Args:
             parent_object (omero.model.DatasetI): The parent dataset object.
             conn (omero.gateway.BlitzGateway): Active OMERO connection.
+            executor (concurrent.futures.Executor, optional): Executor to
+                submit the imports to without waiting for them. The ROIs of
+                these images are not imported. Defaults to None, in which
+                case the images and their ROIs are imported before returning.
 
         Returns:
-            None
+            list: Futures of the submitted imports, empty if no executor
+                was given. The result of each is the (image ID, ROI file
+                path) tuple of ImageFactory.import_image.
         """
         images_data = self.data.get("dataFiles", None)
 
         if images_data is None:
-            return
-
-        for image_data in images_data:
-            if image_data.get("type", None) == "Raw Image Data File":
-                img = ImageFactory(image_data, self.path_to_arc)
-                img.save(conn, parent_object)
+            return []
 
-    def save(self, conn, parent_object=None):
+        factories = [
+            ImageFactory(image_data, self.path_to_arc, arc_files=self._arc_files)
+            for image_data in images_data
+            if image_data.get("type", None) == "Raw Image Data File"
+        ]
+        # largest files first, so no big upload starts last and holds up
+        # the end of the import while the other workers are idle
+        factories.sort(key=ImageFactory.file_size, reverse=True)
+
+        # read here, the import threads do not use the gateway
+        session = _import_session(conn)
+        dataset_id = parent_object.getId()._val
+
+        if executor is not None:
+            return [
+                executor.submit(img.import_image, session, dataset_id)
+                for img in factories
+            ]
+
+        with ThreadPoolExecutor(max_workers=IMPORT_WORKERS) as executor:
+            # list() propagates the first exception raised by an import
+            imported = list(executor.map(
+                lambda img: img.import_image(session, dataset_id), factories
+            ))
+        for image_id, roidata_filepath in imported:
+            if image_id is not None and roidata_filepath is not None:
+                import_rois_from_json(
+                    roidata_filepath, ImageI(image_id, False), conn
+                )
+        return []
+
+    def save(self, conn, parent_object=None, update=None, executor=None):
         """Save and create an OMERO dataset from ISA assay data.
 
         Creates the dataset, adds metadata annotations, imports associated images,
@@ -500,6 +820,12 @@ class DatasetFactory:
             conn (omero.gateway.BlitzGateway): Active OMERO connection.
             parent_object (omero.model.ProjectI, optional): Parent project object
                 to link the dataset to. Defaults to None.
+            update (omero.api.IUpdatePrx, optional): Update service to use.
+                Defaults to conn.getUpdateService().
+            executor (concurrent.futures.Executor, optional): Executor the
+                image imports are submitted to. The futures are stored in
+                self.futures and not waited for, and the ROIs are left to
+                the caller. Defaults to None.
 
         Returns:
             omero.model.DatasetI: The created OMERO dataset object.
@@ -507,24 +833,28 @@ class DatasetFactory:
         Raises:
             AssertionError: If 'comments' field is missing or has no identifier.
         """
-        comments = self.data.get("comments", None)
-        assert comments is not None
-        for comment in comments:
-            assert isinstance(comment, dict)
-            if comment.get("name", None) == "identifier":
-                dataset_name = comment.get("value")
-                break
+        assert self.data.get("comments", None) is not None
+        # the first identifier names the dataset
+        comments = _comments_to_dict(self.data, first_wins=True)
+        assert "identifier" in comments
+        dataset_name = comments["identifier"]
 
         dataset = DatasetI()
         dataset.setName(rtypes.rstring(dataset_name))
 
+        if update is None:
+            update = conn.getUpdateService()
+
         # Save the dataset to the server
-        dataset = conn.getUpdateService().saveAndReturnObject(dataset)
+        dataset = update.saveAndReturnObject(dataset)
         self._add_mapped_annotations(dataset, conn)
-        self._add_images(dataset, conn)
-
         if parent_object is not None:
-            link(parent_object, dataset, conn)
+            self._pending.append(create_link(parent_object, dataset))
+        save_links(
+            self._pending, conn, update=update, batch_size=self.batch_size
+        )
+
+        self.futures = self._add_images(dataset, conn, executor=executor)
 
         return dataset
 
@@ -558,51 +888,73 @@ class MappedAnnotationFactory:
         >>> annotation = factory.save(conn, parent_project)
 
     Raises:
-        AssertionError: If data doesn't contain required 'comments' field or
-            if comments don't have proper namespace annotation.
+        AnnotationDataError: If data doesn't contain required 'comments'
+            field or if comments don't have proper namespace annotation.
     """
 
-    def __init__(self, data):
+    def __init__(self, data, validate=True):
         """Initialize the MappedAnnotationFactory.
 
         Args:
             data (dict): ISA data structure containing metadata and comments.
+            validate (bool, optional): Check data with is_annotatable. Callers
+                that have already done so pass False. Defaults to True.
 
         Raises:
-            AssertionError: If data is not a dict, doesn't contain 'comments',
-                or comments don't have 'omero_annotation_namespace' as first entry.
+            AnnotationDataError: If data is not a dict, doesn't contain
+                'comments', or comments don't have 'omero_annotation_namespace'
+                as first entry. A subclass of both ValueError and
+                AssertionError.
         """
-        assert isinstance(data, dict)
-        assert "comments" in data.keys()
-        assert len(data["comments"]) >= 1
-        assert data["comments"][0].get("name", None) is not None
-        assert data["comments"][0].get("value", None) is not None
-
-        assert data["comments"][0]["name"] == "omero_annotation_namespace"
+        if validate and not self.is_annotatable(data):
+            raise AnnotationDataError(
+                "data has no 'omero_annotation_namespace' as first comment"
+            )
         self.namespace = data["comments"][0]["value"]
         self.data = data
 
         mapping = {}
 
-        ontology_annotation_keys = ["termAccession", "termSource", "annotationValue"]
-
         for k, v in data.items():
 
-            if not isinstance(v, (list, dict)):
-                mapping[k] = v
-
             # ontology annotation keys are prefixed with the parent key
             if isinstance(v, dict):
-
-                if set(ontology_annotation_keys).issubset(set(v.keys())):
-                    mapping[f"{k}_term"] = v["annotationValue"]
-                    mapping[f"{k}_term_accession"] = v["termAccession"]
-                    mapping[f"{k}_term_source"] = v["termSource"]
+                if v.keys() >= ONTOLOGY_ANNOTATION_KEYS:
+                    term, accession, source = _term_keys(k)
+                    mapping[term] = v["annotationValue"]
+                    mapping[accession] = v["termAccession"]
+                    mapping[source] = v["termSource"]
+            elif not isinstance(v, list):
+                mapping[k] = v
 
         self.mapping = mapping
 
         self._create_mapped_annotation()
 
+    @staticmethod
+    def is_annotatable(data):
+        """Check whether an ISA data structure holds a mapped annotation.
+
+        Data is annotatable if it is a dict whose first comment is named
+        'omero_annotation_namespace' and has a value.
+
+        Args:
+            data: Any value of the ISA data structure.
+
+        Returns:
+            bool: True if a MappedAnnotationFactory can be created from data.
+        """
+        if not isinstance(data, dict):
+            return False
+        comments = data.get("comments")
+        if not comments:
+            return False
+        first = comments[0]
+        return (
+            first.get("name") == "omero_annotation_namespace"
+            and first.get("value") is not None
+        )
+
     def _create_mapped_annotation(self):
         """Create the MapAnnotation object from the processed mapping.
 
@@ -613,16 +965,29 @@ class MappedAnnotationFactory:
             None
         """
         map_annotation = MapAnnotationI()
-        map_value_ls = [
-            NamedValue(str(key), str(self.mapping[key])) for key in self.mapping
-        ]
+        map_value_ls = list(_named_values(tuple(self.mapping.items())))
         map_annotation.setMapValue(map_value_ls)
 
         map_annotation.setNs(rtypes.rstring(self.namespace))
 
         self.map_annotation = map_annotation
 
-    def save(self, conn, parent_object=None):
+    def create_link(self, parent_object):
+        """Create an unsaved link of the annotation to a parent object.
+
+        Saving the link also creates the annotation, so many annotations
+        can be stored with one saveAndReturnArray call (see save_links).
+
+        Args:
+            parent_object (omero.model.ModelObject): Parent OMERO object
+                (Project, Dataset, or Image) to annotate.
+
+        Returns:
+            omero.model.AnnotationLinkI: The unsaved link object.
+        """
+        return create_link(parent_object, self.map_annotation)
+
+    def save(self, conn, parent_object=None, update=None):
         """Save the mapped annotation to OMERO.
 
         Persists the MapAnnotation to the OMERO database and optionally links it
@@ -632,23 +997,281 @@ class MappedAnnotationFactory:
             conn (omero.gateway.BlitzGateway): Active OMERO connection.
             parent_object (omero.model.ModelObject, optional): Parent OMERO object
                 to link the annotation to. Defaults to None.
+            update (omero.api.IUpdatePrx, optional): Update service to use.
+                Defaults to conn.getUpdateService().
 
         Returns:
-            omero.model.AnnotationLinkI: The annotation link object.
+            omero.model.AnnotationLinkI or omero.model.MapAnnotationI: The
+                saved annotation link, or the saved annotation if no parent
+                object is given.
 
         Raises:
             RuntimeError: If the save operation fails.
+
+        Note:
+            - With a parent object only the link is saved; the unsaved
+              annotation is created together with it in one call
         """
-        map_ann = conn.getUpdateService().saveAndReturnObject(self.map_annotation)
+        if update is None:
+            update = conn.getUpdateService()
 
-        if parent_object is not None:
-            link(parent_object, self.map_annotation, conn)
+        if parent_object is None:
+            return update.saveAndReturnObject(self.map_annotation)
+        return link(parent_object, self.map_annotation, conn, update=update)
+
+
+
+
+
+def file_exists(path, listings):
+    """Check whether a file exists using cached directory listings.
+
+    The directory of path is listed with os.scandir the first time a file
+    in it is checked. Later checks in the same directory are dict lookups,
+    so an assay with many images costs one listing instead of one stat()
+    call per file, which matters on network filesystems.
+
+    Args:
+        path (Path): Path of the file.
+        listings (dict): Cache mapping directories to dicts of the names of
+            the files they contain and their sizes. Filled as a side effect.
+
+    Returns:
+        bool: True if path is an existing file.
+    """
+    return path.name in _listing(path.parent, listings)
+
+
+def cached_file_size(path, listings):
+    """Return the size of a file from cached directory listings.
+
+    Args:
+        path (Path): Path of the file.
+        listings (dict): Cache of directory listings, see file_exists.
+
+    Returns:
+        int or None: The size in bytes, None if path is not an existing file.
+    """
+    return _listing(path.parent, listings).get(path.name)
+
+
+def _listing(directory, listings):
+    """Return the cached files of a directory, listing it on a cache miss."""
+    files = listings.get(directory)
+    if files is None:
+        files = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            files[entry.name] = entry.stat().st_size
+                    except OSError:
+                        # removed while listing
+                        continue
+        except OSError:
+            pass
+        listings[directory] = files
+    return files
+
+
+def _named_values(items):
+    """Return the NamedValues of the items of a mapping.
+
+    Identical mappings are common, e.g. the same ontology term on many
+    entities, so the NamedValues of mappings with only string values are
+    built once per distinct mapping. Other values are converted without
+    the cache: 1, 1.0 and True are equal as cache keys but have different
+    strings.
+
+    Args:
+        items (tuple): (key, value) pairs of the mapping.
+
+    Returns:
+        tuple: The NamedValue objects, in the order of items.
+    """
+    if all(type(value) is str for _, value in items):
+        return _str_named_values(items)
+    # keys come from JSON objects and are always strings
+    return tuple(NamedValue(key, str(value)) for key, value in items)
+
+
+@functools.lru_cache(maxsize=1024)
+def _str_named_values(items):
+    """Return the NamedValues of (key, value) pairs with string values.
+
+    Args:
+        items (tuple): (key, value) pairs, all values are str.
+
+    Returns:
+        tuple: The NamedValue objects, in the order of items.
+    """
+    return tuple(NamedValue(key, value) for key, value in items)
 
 
+@functools.lru_cache(maxsize=256)
+def _term_keys(key):
+    """Return the interned mapping keys of an ontology annotation.
 
+    Args:
+        key (str): Key of the ontology annotation in the ISA data.
+
+    Returns:
+        tuple: The <key>_term, <key>_term_accession and <key>_term_source keys.
+    """
+    return tuple(sys.intern(key + suffix) for suffix in _TERM_SUFFIXES)
+
+
+def _comments_to_dict(data, first_wins=False):
+    """Map the names of the comments of an ISA data structure to their values.
+
+    Args:
+        data (dict): ISA data structure with an optional 'comments' list.
+        first_wins (bool, optional): If a name occurs more than once, keep
+            the first value instead of the last. Defaults to False.
 
+    Returns:
+        dict: Comment values by comment name.
+    """
+    comments = data.get("comments", ())
+    if first_wins:
+        comments = reversed(comments)
+    return {c["name"]: c.get("value") for c in comments}
+
+
+def _iter_candidates(data, exclude=()):
+    """Yield the values of a dict that may hold mapped annotations.
 
-def link(obj1, obj2, conn):
+    Yields each value of data and each element of list-valued entries. The
+    dict itself is not yielded.
+
+    Args:
+        data (dict): ISA data structure.
+        exclude (tuple): Keys whose values are skipped.
+
+    Yields:
+        The candidate values.
+    """
+    for k, v in data.items():
+        if k in exclude:
+            continue
+        if isinstance(v, list):
+            yield from v
+        else:
+            yield v
+
+
+@functools.lru_cache(maxsize=64)
+def _link_class(type1, type2):
+    """Return the link class between two OMERO model types.
+
+    Args:
+        type1 (type): Type of the parent object.
+        type2 (type): Type of the child object, or Annotation for any
+            annotation.
+
+    Returns:
+        type: The link class, e.g. ProjectDatasetLinkI.
+
+    Raises:
+        AssertionError: If the OMERO model has no link between the types.
+    """
+    otype1 = type1.ice_staticId().split("::")[-1]
+    if type2 is Annotation:
+        otype2 = "Annotation"
+    else:
+        otype2 = type2.ice_staticId().split("::")[-1]
+    try:
+        return getattr(model, "%s%sLinkI" % (otype1, otype2))
+    except AttributeError:
+        assert False, "Object type not supported."
+
+
+def _link_end(obj):
+    """Return the object to set as parent or child of a link.
+
+    Unsaved objects are used as they are, so saving the link creates them.
+    Saved objects are replaced by their proxy, which is created once and
+    kept on the object, since a project or dataset is usually linked to
+    many children and annotations.
+
+    Args:
+        obj (omero.model.IObject): Object to link.
+
+    Returns:
+        omero.model.IObject: obj or its unloaded proxy.
+    """
+    if obj.id is None:
+        return obj
+    proxy = getattr(obj, "_link_proxy", None)
+    if proxy is None:
+        proxy = obj.proxy()
+        obj._link_proxy = proxy
+    return proxy
+
+
+def create_link(obj1, obj2):
+    """Create, but do not save, a link between two OMERO objects.
+
+    Instantiates the correct link class (e.g. ProjectDatasetLinkI,
+    DatasetImageLinkI, etc) for the two object types. Objects without an
+    ID are set as they are, so saving the link creates them as well;
+    existing objects are set as proxies.
+
+    Args:
+        obj1 (omero.model.ModelObject): Parent object to link from.
+        obj2 (omero.model.ModelObject or Annotation): Child object to link to.
+
+    Returns:
+        omero.model.LinkI: The unsaved link object.
+
+    Raises:
+        AssertionError: If the object types are not linkable or not supported
+            by the OMERO model.
+    """
+    if isinstance(obj2, Annotation):
+        linktype = _link_class(type(obj1), Annotation)
+    else:
+        linktype = _link_class(type(obj1), type(obj2))
+
+    link = linktype()
+    link.setParent(_link_end(obj1))
+    link.setChild(_link_end(obj2))
+    return link
+
+
+def save_links(links, conn, update=None, batch_size=None):
+    """Save a list of links with a single saveAndReturnArray call.
+
+    The list is emptied afterwards, so it can be reused as a buffer.
+
+    Args:
+        links (list): Unsaved link objects, see create_link.
+        conn (omero.gateway.BlitzGateway): Active OMERO connection.
+        update (omero.api.IUpdatePrx, optional): Update service to use.
+            Defaults to conn.getUpdateService().
+        batch_size (int, optional): If given, links are saved in calls of
+            at most batch_size links, which keeps the Ice messages small.
+            Defaults to None (all in one call).
+
+    Returns:
+        list: The saved link objects.
+    """
+    if not links:
+        return []
+    if update is None:
+        update = conn.getUpdateService()
+    if batch_size is None:
+        saved = update.saveAndReturnArray(links)
+    else:
+        saved = []
+        for i in range(0, len(links), batch_size):
+            saved.extend(update.saveAndReturnArray(links[i:i + batch_size]))
+    links.clear()
+    return saved
+
+
+def link(obj1, obj2, conn, update=None):
     """Link two OMERO objects together.
 
     Creates a link between two OMERO model objects by instantiating the correct
@@ -660,6 +1283,8 @@ def link(obj1, obj2, conn):
         obj1 (omero.model.ModelObject): Parent object to link from.
         obj2 (omero.model.ModelObject or Annotation): Child object to link to.
         conn (omero.gateway.BlitzGateway): Active OMERO connection for saving.
+        update (omero.api.IUpdatePrx, optional): Update service to use.
+            Defaults to conn.getUpdateService().
 
     Returns:
         omero.model.LinkI: The created and persisted link object.
@@ -679,25 +1304,6 @@ def link(obj1, obj2, conn):
         - Annotations are always treated as child objects
         - Uses proxy() for objects with existing IDs to avoid conflicts
     """
-    otype1 = obj1.ice_staticId().split("::")[-1]
-    if isinstance(obj2, Annotation):
-        otype2 = "Annotation"
-    else:
-        otype2 = obj2.ice_staticId().split("::")[-1]
-    try:
-        linktype = getattr(model, "%s%sLinkI" % (otype1, otype2))
-    except AttributeError:
-        assert False, "Object type not supported."
-
-    link = linktype()
-
-    # Check if object exist or not
-    if obj1.id is None:
-        link.setParent(obj1)
-    else:
-        link.setParent(obj1.proxy())
-    if obj2.id is None:
-        link.setChild(obj2)
-    else:
-        link.setChild(obj2.proxy())
-    return conn.getUpdateService().saveAndReturnObject(link)
\ No newline at end of file
+    if update is None:
+        update = conn.getUpdateService()
+    return update.saveAndReturnObject(create_link(obj1, obj2))
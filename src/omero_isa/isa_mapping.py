@@ -18,6 +18,11 @@ Classes:
 
 Functions:
     get_image_metadata_omero: Extract image metadata from OMERO image object
+    fetch_dataset_images: Load the images of a dataset and their metadata
+    fetch_datasets_images: Load the images of many datasets with one query
+    fetch_project_datasets: Load the datasets of a project and their annotations
+    copy_image_file: Copy an image file, optionally as a hard link or reflink
+    assay_identifier: Get the identifier and folder name of a dataset's assay
 
 Author:
     Christoph Möhl
@@ -32,12 +37,48 @@ from isatools.isajson import ISAJSONEncoder
 
 from pathlib import Path
 
-from functools import lru_cache
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from functools import cached_property, lru_cache
 import os
 import shutil
 
+from omero.sys import ParametersI
+from omero.rtypes import unwrap
+
 from omero_isa.roi import export_rois_to_json
 
+# number of image files copied concurrently during export
+EXPORT_WORKERS = 8
+
+# ways of copying exported image files, see copy_image_file
+COPY_MODES = ("link", "reflink", "copy")
+
+# datasets of a project with their annotations, loaded in one query
+PROJECT_DATASETS_QUERY = (
+    "select distinct d from Dataset d"
+    " left outer join fetch d.annotationLinks al"
+    " left outer join fetch al.child"
+    " where d.id in"
+    " (select link.child.id from ProjectDatasetLink link"
+    " where link.parent.id = :id)"
+    " order by d.id"
+)
+
+# images of many datasets with pixels, owner and creation event, loaded in
+# one query, with the dataset of each image
+DATASET_IMAGES_QUERY = (
+    "select link from DatasetImageLink link"
+    " join fetch link.child i"
+    " join fetch i.pixels"
+    " join fetch i.details.owner"
+    " join fetch i.details.creationEvent"
+    " where link.parent.id in (:ids)"
+    " order by i.id"
+)
+
 
 def get_image_metadata_omero(image):
     """Extract metadata from an OMERO image object.
@@ -74,41 +115,336 @@ def get_image_metadata_omero(image):
         ...
 
     Note:
-        - Pixel unit is extracted from image's pixel size metadata
-        - Returns None for pixel_size_unit if no unit is defined
-        - All metadata values are converted to strings
+        - Pixel sizes and unit are read from the image's primary pixels,
+          which are loaded only once
+        - pixel_size_unit is empty if no unit is defined
+        - All metadata values are converted to strings, missing values
+          (e.g. pixel sizes that are not set) become empty strings
     """
 
-    def _pixel_unit(image):
-        """Get pixel size unit from image metadata.
+    # the pixels are fetched once, sizes and units are read off them
+    pixels = image.getPrimaryPixels()._obj
+    physical_size_x = pixels.getPhysicalSizeX()
+
+    isa_columns = (
+        ("omero_image_id", image.getId()),
+        ("name", image.getName()),
+        ("description", image.getDescription()),
+        ("acquisition_time", image.getDate().isoformat()),
+        ("omero_image_owner", image.getAuthor()),
+        ("image_size_x", unwrap(pixels.getSizeX())),
+        ("image_size_y", unwrap(pixels.getSizeY())),
+        ("image_size_z", unwrap(pixels.getSizeZ())),
+        ("pixel_size_x", _size(physical_size_x)),
+        ("pixel_size_y", _size(pixels.getPhysicalSizeY())),
+        ("pixel_size_z", _size(pixels.getPhysicalSizeZ())),
+        ("pixel_size_unit",
+            None if physical_size_x is None else physical_size_x.getUnit()),
+    )
+    return _comments(isa_columns)
+
+
+def fetch_dataset_images(conn, dataset_id):
+    """Load the images of a dataset with everything needed for the export.
+
+    The images are loaded with their pixels, owner and creation event in a
+    single query, so neither listing the images nor reading their metadata
+    needs further server calls.
 
-        Args:
-            image (omero.model.ImageI): OMERO image object.
+    Args:
+        conn (omero.gateway.BlitzGateway): Active OMERO connection.
+        dataset_id (int): ID of the OMERO dataset.
 
-        Returns:
-            str or None: The unit string or None if not set.
-        """
-        pix = image.getPixelSizeX(units=True)
-        if pix is None:
-            return
-        return pix.getUnit()
-
-    isa_column_mapping = {
-        "omero_image_id": image.getId(),
-        "name": image.getName(),
-        "description": image.getDescription(),
-        "acquisition_time": image.getDate().isoformat(),
-        "omero_image_owner": image.getAuthor(),
-        "image_size_x": image.getSizeX(),
-        "image_size_y": image.getSizeY(),
-        "image_size_z": image.getSizeZ(),
-        "pixel_size_x": image.getPixelSizeX(),
-        "pixel_size_y": image.getPixelSizeY(),
-        "pixel_size_z": image.getPixelSizeZ(),
-        "pixel_size_unit": _pixel_unit(image),
+    Returns:
+        tuple: (images, metadata) where images is a list of
+            omero.gateway.ImageWrapper ordered by ID and metadata maps each
+            image ID to its Comment objects, see get_image_metadata_omero.
+    """
+    return fetch_datasets_images(conn, [dataset_id])[dataset_id]
+
+
+def fetch_datasets_images(conn, dataset_ids):
+    """Load the images of many datasets with a single query.
+
+    Same as fetch_dataset_images, but for all datasets of e.g. a project at
+    once, so exporting a project needs one query for all of its images
+    instead of one per dataset.
+
+    Args:
+        conn (omero.gateway.BlitzGateway): Active OMERO connection.
+        dataset_ids (list): IDs of the OMERO datasets.
+
+    Returns:
+        dict: Maps each dataset ID to its (images, metadata) tuple, see
+            fetch_dataset_images. Datasets without images map to
+            ([], {}).
+
+    Examples:
+        >>> images = fetch_datasets_images(conn, [1, 2])
+        >>> [image.getName() for image in images[1][0]]
+        ['image1.tiff', 'image2.czi']
+    """
+    from omero.gateway import ImageWrapper
+
+    dataset_ids = list(dataset_ids)
+    result = {dataset_id: ([], {}) for dataset_id in dataset_ids}
+    if not dataset_ids:
+        return result
+
+    params = ParametersI()
+    params.addIds(dataset_ids)
+    links = conn.getQueryService().findAllByQuery(
+        DATASET_IMAGES_QUERY, params, conn.SERVICE_OPTS
+    )
+    for link in links:
+        image = link.getChild()
+        images, metadata = result[unwrap(link.getParent().getId())]
+        images.append(ImageWrapper(conn, image))
+        metadata[unwrap(image.getId())] = _image_metadata_comments(image)
+    return result
+
+
+def fetch_project_datasets(conn, project_id):
+    """Load the datasets of a project together with their annotations.
+
+    Replaces listing the datasets and then the annotations of each with a
+    single query.
+
+    Args:
+        conn (omero.gateway.BlitzGateway): Active OMERO connection.
+        project_id (int): ID of the OMERO project.
+
+    Returns:
+        tuple: (datasets, annotations) where datasets is a list of
+            omero.gateway.DatasetWrapper ordered by ID and annotations maps
+            each dataset ID to its annotations, wrapped like those returned
+            by listAnnotations().
+
+    Examples:
+        >>> datasets, annotations = fetch_project_datasets(conn, 414)
+        >>> [a.getNs() for a in annotations[datasets[0].getId()]]
+        ['ISA:ASSAY:ASSAY']
+    """
+    from omero.gateway import AnnotationWrapper, DatasetWrapper
+
+    params = ParametersI()
+    params.addId(project_id)
+    loaded = conn.getQueryService().findAllByQuery(
+        PROJECT_DATASETS_QUERY, params, conn.SERVICE_OPTS
+    )
+    datasets = [DatasetWrapper(conn, dataset) for dataset in loaded]
+    annotations = {
+        unwrap(dataset.getId()): [
+            AnnotationWrapper._wrap(conn, link.getChild())
+            for link in dataset.copyAnnotationLinks()
+        ]
+        for dataset in loaded
     }
+    return datasets, annotations
+
+
+def _size(length):
+    """Return the value of an optional unit-bearing length."""
+    return None if length is None else length.getValue()
 
-    return [Comment(k, str(isa_column_mapping[k])) for k in isa_column_mapping]
+
+def _image_metadata_comments(image):
+    """Build the metadata comments of an image loaded with its details.
+
+    Args:
+        image (omero.model.ImageI): Image loaded with pixels, owner and
+            creation event.
+
+    Returns:
+        list: Comment objects, see get_image_metadata_omero.
+    """
+    pixels = image.getPrimaryPixels()
+    owner = image.getDetails().getOwner()
+
+    # same fallback as BlitzGateway's ImageWrapper.getDate
+    acquisition_date = unwrap(image.getAcquisitionDate())
+    if not acquisition_date or acquisition_date <= 0:
+        acquisition_date = unwrap(
+            image.getDetails().getCreationEvent().getTime()
+        )
+
+    physical_size_x = pixels.getPhysicalSizeX()
+    isa_columns = (
+        ("omero_image_id", unwrap(image.getId())),
+        ("name", unwrap(image.getName())),
+        ("description", unwrap(image.getDescription())),
+        ("acquisition_time", datetime.fromtimestamp(
+            acquisition_date / 1000
+        ).isoformat()),
+        ("omero_image_owner",
+            f"{unwrap(owner.getFirstName())} {unwrap(owner.getLastName())}"),
+        ("image_size_x", unwrap(pixels.getSizeX())),
+        ("image_size_y", unwrap(pixels.getSizeY())),
+        ("image_size_z", unwrap(pixels.getSizeZ())),
+        ("pixel_size_x", _size(physical_size_x)),
+        ("pixel_size_y", _size(pixels.getPhysicalSizeY())),
+        ("pixel_size_z", _size(pixels.getPhysicalSizeZ())),
+        ("pixel_size_unit",
+            None if physical_size_x is None else physical_size_x.getUnit()),
+    )
+    return _comments(isa_columns)
+
+
+def _comments(pairs):
+    """Build Comment objects from (name, value) pairs.
+
+    Missing values become empty strings rather than the string "None".
+
+    Args:
+        pairs (tuple): (name, value) pairs.
+
+    Returns:
+        list: One Comment per pair.
+    """
+    return [Comment(k, "" if v is None else str(v)) for k, v in pairs]
+
+
+def copy_image_file(src, dst, copy_mode="copy"):
+    """Copy an image file into the export directory.
+
+    Exported images are often large, and copying them byte by byte dominates
+    the export time. A regular copy is made unless copy_mode opts in to a
+    cheaper way, which is tried first, falling back to a regular copy:
+    - "link": hard link dst to src (no data is copied), then as "reflink"
+    - "reflink": copy in the kernel with os.copy_file_range, which
+      copy-on-write filesystems (Btrfs, XFS) turn into a reflink
+    - "copy": regular copy with shutil.copy2
+
+    Args:
+        src (Path): Path of the image file.
+        dst (Path): Path of the copy. An existing file is replaced.
+        copy_mode (str, optional): One of "link", "reflink" or "copy".
+            Defaults to "copy".
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If copy_mode is not supported.
+
+    Note:
+        - A hard link shares its data with src; use "reflink" or "copy" if
+          src may be modified after the export
+    """
+    if copy_mode not in COPY_MODES:
+        raise ValueError(
+            f"copy_mode must be one of {', '.join(COPY_MODES)}, not {copy_mode!r}"
+        )
+
+    if copy_mode == "link":
+        try:
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            os.link(src, dst)
+            return
+        except OSError:
+            # e.g. source and destination on different filesystems
+            pass
+
+    if copy_mode in ("link", "reflink") and hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        fsrc.fileno(), fdst.fileno(), remaining
+                    )
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+
+
+def _is_up_to_date(dst_stat, src_stat):
+    """Check if a copy of a file can be kept instead of copying it again.
+
+    Args:
+        dst_stat (os.stat_result or None): Status of the existing copy, None
+            if there is none.
+        src_stat (os.stat_result): Status of the file.
+
+    Returns:
+        bool: True if the copy has the size of the file and is not older.
+    """
+    return (
+        dst_stat is not None
+        and dst_stat.st_size == src_stat.st_size
+        and dst_stat.st_mtime >= src_stat.st_mtime
+    )
+
+
+@lru_cache(maxsize=None)
+def _ontology_prefixes(ontology_config):
+    """Return the key prefixes of the ontology annotations of a config entry.
+
+    The ontology annotation names are fixed per annotation type, so the
+    prefixes are computed once per process and shared by all mappers.
+
+    Args:
+        ontology_config (tuple): Names of the ontology annotations, see
+            "ontology_annotations" in isa_attribute_config.
+
+    Returns:
+        tuple: (name, key prefix, prefix length) of each ontology annotation.
+    """
+    return tuple((ont, f"{ont}_", len(ont) + 1) for ont in ontology_config)
+
+
+class _NamedValues:
+    """Read-only view of the key-value pairs of a map annotation.
+
+    Supports the get() and items() lookups _create_isa_attributes does on
+    annotation data without building a dict per annotation. Annotations
+    have few keys, so a linear scan is as fast as hashing. As with a dict
+    built from the pairs, the last value of a repeated key wins.
+
+    Attributes:
+        pairs (list): (key, value) tuples as returned by getValue().
+    """
+
+    __slots__ = ("pairs",)
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+
+    def get(self, key, default=None):
+        for k, v in reversed(self.pairs):
+            if k == key:
+                return v
+        return default
+
+    def items(self):
+        return iter(self.pairs)
+
+
+def _create_publications(isa_obj, publication_params):
+    """Add publications to an ISA object.
+
+    Args:
+        isa_obj: The ISA object (Investigation or Study).
+        publication_params (dict or None): Publication attributes, see
+            AbstractIsaMapper._create_isa_attributes. Nothing is added if
+            None.
+
+    Returns:
+        None
+    """
+    if publication_params is not None:
+        for publication_params, pub_ontology_params in zip(publication_params["values"], publication_params["ontology_values"]):
+            pub = Publication(**publication_params)
+            pub.status = pub_ontology_params.get("status", None)
+            isa_obj.publications.append(pub)
 
 
 class AbstractIsaMapper:
@@ -154,53 +490,72 @@ class AbstractIsaMapper:
             annotation_data = self._annotation_data(annotation_type)
             config = self.isa_attribute_config[annotation_type]
 
-            ontology_config = config.get("ontology_annotations", None)
-            ontology_annotation_attributes = []
+            defaults = config["default_values"]
+            # computed once per type, not per annotation
+            non_null_defaults = {k: v for k, v in defaults.items() if v is not None}
 
-            for i in range(len(annotation_data)):
-                ontology_annotation_attribute = {}
-                if ontology_config is not None:
+            if len(annotation_data) == 0 and len(non_null_defaults) == 0:
+                # neither annotations nor defaults, the type is left out
+                continue
+
+            ontology_config = config.get("ontology_annotations", None)
+            if ontology_config is None:
+                # no ontology annotations to split off
+                ontology_annotation_attributes = [{} for _ in annotation_data]
+            else:
+                ontology_annotation_attributes = []
+                prefixes = _ontology_prefixes(tuple(ontology_config))
+
+                for i in range(len(annotation_data)):
+                    ontology_annotation_attribute = {}
+
+                    # split the keys into the ontology annotations they are
+                    # prefixed with and the remaining plain values
+                    buckets = {ont: {} for ont in ontology_config}
+                    remaining = {}
+                    for k, v in annotation_data[i].items():
+                        for ont, prefix, prefix_len in prefixes:
+                            if k.startswith(prefix):
+                                buckets[ont][k[prefix_len:]] = v
+                                break
+                        else:
+                            remaining[k] = v
+                    annotation_data[i] = remaining
 
                     for ont in ontology_config:
 
-                        ontology_annotation = {}
-                        ontology_annotation = {k.replace(f"{ont}_", ''): v for k, v in annotation_data[i].items() if ont in k}
-                        annotation_data[i] = {k: v for k, v in annotation_data[i].items() if ont not in k}
+                        ontology_annotation = buckets[ont]
 
                         source_annotation = ontology_annotation.get("term_source", None)
                         if source_annotation is not None:
-                            ontology_annotation["term_source"] = OntologySource(ontology_annotation["term_source"])
+                            ontology_annotation["term_source"] = self._ontology_source(source_annotation)
                         ontology_annotation_attribute[ont] = OntologyAnnotation(**ontology_annotation)
 
-                ontology_annotation_attributes.append(ontology_annotation_attribute)
+                    ontology_annotation_attributes.append(ontology_annotation_attribute)
 
             isa_attributes[annotation_type] = {}
             isa_attributes[annotation_type]["values"] = []
             isa_attributes[annotation_type]["ontology_values"] = ontology_annotation_attributes
 
-            values_to_set = {}
-
             if len(annotation_data) == 0:
                 # set defaults if no annotations available
-                for key in config["default_values"]:
-                    value = config["default_values"][key]
-                    if value is not None:
-                        values_to_set[key] = value
-                if len(values_to_set) > 0:
-                    isa_attributes[annotation_type]["values"].append(values_to_set)
+                if len(non_null_defaults) > 0:
+                    isa_attributes[annotation_type]["values"].append(non_null_defaults)
                     isa_attributes[annotation_type]["ontology_values"].append({})
 
             else:
-                # set annotation value if key is registered in config["default_values"]
+                # set annotation value if key is registered in config["default_values"],
+                # each annotation starts from the defaults only
                 for annotation in annotation_data:
-                    for key in config["default_values"]:
-                        value = annotation.get(key, config["default_values"][key])
-                        if value is not None:
-                            values_to_set[key] = value
+                    values_to_set = {
+                        **non_null_defaults,
+                        **{
+                            k: v for k, v in annotation.items()
+                            if k in defaults and v is not None
+                        },
+                    }
                     if len(values_to_set) > 0:
-                        isa_attributes[annotation_type]["values"].append(
-                            values_to_set.copy()
-                        )
+                        isa_attributes[annotation_type]["values"].append(values_to_set)
 
             if len(isa_attributes[annotation_type]["values"]) == 0:
                 del isa_attributes[annotation_type]
@@ -209,21 +564,54 @@ class AbstractIsaMapper:
 
             # OMERO metadata export: namespaces are saved in ISA comments
             # to facilitate ISA import back to OMERO
-            self.isa_attributes = isa_attributes
-
             if annotation_type in isa_attributes.keys():
                 for i in range(len(isa_attributes[annotation_type]["values"])):
                     isa_attributes[annotation_type]["values"][i]["comments"] = [Comment("omero_annotation_namespace", config["namespace"])]
-                    self.isa_attributes = isa_attributes
 
-    @lru_cache
-    def _all_annotatation_objects(self):
-        """Get all annotation objects from the OMERO object.
+        self.isa_attributes = isa_attributes
+
+    @cached_property
+    def _ontology_sources(self):
+        """OntologySource objects of this mapper by name, see _ontology_source."""
+        return {}
+
+    def _ontology_source(self, name):
+        """Return the OntologySource referenced by name in ontology annotations.
+
+        Many annotations reference the same few sources (e.g. "OBI"), so the
+        annotations of one mapper share one object per name. Other mappers,
+        e.g. of later exports, get their own objects.
+
+        Args:
+            name (str): Name of the ontology source.
 
         Returns:
-            list: List of all annotation objects.
+            OntologySource: The source.
         """
-        return [a for a in self.obj.listAnnotations()]
+        source = self._ontology_sources.get(name)
+        if source is None:
+            source = self._ontology_sources[name] = OntologySource(name)
+        return source
+
+    @cached_property
+    def _annotations_by_ns(self):
+        """Get the annotation data of the OMERO object grouped by namespace.
+
+        Uses the annotations passed to the mapper if they were prefetched
+        (see fetch_project_datasets), otherwise lists them from the server. The
+        annotations are walked once, instead of once per annotation type.
+
+        Returns:
+            dict: Maps each namespace to the list of _NamedValues views of
+                the key-value pairs of its annotations.
+        """
+        annotations = getattr(self, "annotations", None)
+        if annotations is None:
+            annotations = self.obj.listAnnotations()
+        by_ns = defaultdict(list)
+        for annotation in annotations:
+            by_ns[annotation.getNs()].append(_NamedValues(annotation.getValue()))
+        return dict(by_ns)
 
     def _annotation_data(self, annotation_type):
         """Extract annotation data matching a specific namespace.
@@ -232,14 +620,27 @@ class AbstractIsaMapper:
             annotation_type (str): The annotation type (key in isa_attribute_config).
 
         Returns:
-            list: List of dicts containing annotation key-value pairs.
+            list: List of _NamedValues views of the annotation key-value
+                pairs.
         """
         namespace = self.isa_attribute_config[annotation_type]["namespace"]
-        annotation_data = []
-        for annotation in self._all_annotatation_objects():
-            if annotation.getNs() == namespace:
-                annotation_data.append(dict(annotation.getValue()))
-        return annotation_data
+        # a new list, _create_isa_attributes replaces its items
+        return list(self._annotations_by_ns.get(namespace, ()))
+
+
+def assay_identifier(ome_dataset):
+    """Get the identifier of the assay an OMERO dataset is mapped to.
+
+    The identifier also names the assay folder, so datasets whose names
+    only differ in case or spaces vs. hyphens share a folder.
+
+    Args:
+        ome_dataset (omero.gateway.DatasetWrapper): The OMERO dataset.
+
+    Returns:
+        str: The lower-case dataset name with spaces replaced by hyphens.
+    """
+    return ome_dataset.getName().lower().replace(" ", "-")
 
 
 class OmeroDatasetMapper(AbstractIsaMapper):
@@ -254,6 +655,10 @@ class OmeroDatasetMapper(AbstractIsaMapper):
         destination_path (Path): Path where assay files will be saved.
         path_omero_data (Path): Path to extracted OMERO image files.
         image_filenames_mapping (dict): Maps image IDs to filenames.
+        annotations (list or None): Prefetched annotations of the dataset.
+        copy_mode (str): How image files are copied, see copy_image_file.
+        roi_service (omero.api.IRoiPrx): ROI service the image threads
+            export the ROIs with.
         assay_identifier (str): Unique identifier for the assay.
         assay (isatools.model.Assay): The created ISA Assay object.
 
@@ -281,7 +686,12 @@ class OmeroDatasetMapper(AbstractIsaMapper):
                  path_omero_data,
                  image_filenames_mapping,
                  destination_path,
-                 image_filename_getter=None):
+                 image_filename_getter=None,
+                 annotations=None,
+                 copy_mode="copy",
+                 images=None,
+                 executor=None,
+                 roi_service=None):
         """Initialize the OmeroDatasetMapper.
 
         Args:
@@ -292,15 +702,37 @@ class OmeroDatasetMapper(AbstractIsaMapper):
             destination_path (Path): Output directory for assay files.
             image_filename_getter (callable, optional): Function to get image filename
                 from image ID. Defaults to None.
+            annotations (list, optional): Prefetched annotations of the
+                dataset, see fetch_project_datasets. Defaults to None (annotations
+                are listed from the server).
+            copy_mode (str, optional): How image files are copied into the
+                export, see copy_image_file. Defaults to "copy".
+            images (tuple, optional): Prefetched images of the dataset and
+                their metadata, see fetch_datasets_images. Defaults to None
+                (images are loaded from the server).
+            executor (concurrent.futures.Executor, optional): Executor the
+                images are exported in, e.g. one shared by all datasets of a
+                project. Defaults to None (a pool of EXPORT_WORKERS threads
+                for this dataset).
+            roi_service (omero.api.IRoiPrx, optional): ROI service the
+                ROIs are exported with. The gateway is not thread-safe, so
+                the image threads do not use conn. Defaults to None (a raw
+                proxy is created from conn).
         """
         self.obj = ome_dataset
+        self.images = images
+        self.executor = executor
         self.conn = conn
+        if roi_service is None:
+            roi_service = conn.c.sf.getRoiService()
+        self.roi_service = roi_service
+        self.annotations = annotations
+        self.copy_mode = copy_mode
         self.destination_path = destination_path
         self.path_omero_data = path_omero_data
         self.image_filenames_mapping = image_filenames_mapping
-        owner = ome_dataset.getOwner()
 
-        self.assay_identifier = self.obj.getName().lower().replace(" ", "-")
+        self.assay_identifier = assay_identifier(self.obj)
 
         self.isa_attribute_config = {
             "assay": {
@@ -340,24 +772,42 @@ class OmeroDatasetMapper(AbstractIsaMapper):
             self.destination_path / dest_image_folder_rel
         )
 
-        for image in self.conn.getObjects(
-            "Image", opts={"dataset": self.obj.getId()}
-        ):
-            img_filepath_abs = self.image_filename(image.getId(), abspath=True)
-            img_filepath_rel = self.image_filename(
-                image.getId(), abspath=False
+        if self.images is not None:
+            images, images_metadata = self.images
+        else:
+            images, images_metadata = fetch_dataset_images(
+                self.conn, self.obj.getId()
             )
-            target_path = dest_image_folder / img_filepath_rel.name
-            target_path_rel = dest_image_folder_rel / img_filepath_rel.name
 
-            os.makedirs(target_path.parent, exist_ok=True)
-            # save original image file
-            shutil.copy2(img_filepath_abs, target_path)
-            # save rois if exist
-            roi_path = target_path.with_suffix("").with_name(target_path.stem + "_roidata").with_suffix(".json")
-            roidata_path = export_rois_to_json(roi_path, image, self.conn)
-
-            image_metadata = get_image_metadata_omero(image)
+        os.makedirs(dest_image_folder, exist_ok=True)
+        # files left by a previous export into the same folder
+        with os.scandir(dest_image_folder) as entries:
+            existing = {
+                entry.name: entry.stat()
+                for entry in entries if entry.is_file()
+            }
+
+        # image files are copied and ROIs exported by worker threads, both
+        # wait on the disk or the server; the data files are added in the
+        # order of the images afterwards
+        if self.executor is not None:
+            pool = nullcontext(self.executor)
+        else:
+            pool = ThreadPoolExecutor(max_workers=EXPORT_WORKERS)
+        with pool as executor:
+            exports = [
+                executor.submit(
+                    self._export_image, image, dest_image_folder, existing
+                )
+                for image in images
+            ]
+
+        for image, export in zip(images, exports):
+            # re-raises the error of a failed export
+            target_name, roidata_path = export.result()
+            target_path_rel = dest_image_folder_rel / target_name
+
+            image_metadata = images_metadata[image.getId()]
 
             if roidata_path is not None:
                 image_metadata.append(Comment("roidata_filename", roidata_path.name))
@@ -367,6 +817,40 @@ class OmeroDatasetMapper(AbstractIsaMapper):
                                     comments=image_metadata)
             self.assay.data_files.append(img_datafile)
 
+    def _export_image(self, image, dest_image_folder, existing=None):
+        """Copy an image file and its ROIs into the assay folder.
+
+        Runs in a worker thread of _create_assay. The image file is not
+        copied again if the folder already holds a file of the same name
+        and size that is not older than the image file, e.g. from a
+        previous export. The ROIs are always exported, they may have
+        changed on the server.
+
+        Args:
+            image (omero.gateway.ImageWrapper): The image to export.
+            dest_image_folder (Path): Folder the image file is copied to.
+            existing (dict, optional): Maps the names of the files already
+                in dest_image_folder to their os.stat_result. Defaults to
+                None (the image file is always copied).
+
+        Returns:
+            tuple: (name of the copied image file, path of the ROI JSON
+                file or None if the image has no ROIs).
+        """
+        img_filepath_rel, img_filepath_abs = self.image_paths(image.getId())
+        target_path = dest_image_folder / img_filepath_rel.name
+
+        # save original image file
+        previous = None if existing is None else existing.get(target_path.name)
+        if not _is_up_to_date(previous, os.stat(img_filepath_abs)):
+            copy_image_file(img_filepath_abs, target_path, self.copy_mode)
+        # save rois if exist
+        roi_path = target_path.with_name(target_path.stem + "_roidata").with_suffix(".json")
+        roidata_path = export_rois_to_json(
+            roi_path, image, self.conn, roi_service=self.roi_service
+        )
+        return img_filepath_rel.name, roidata_path
+
     def image_filename(self, image_id, abspath=True):
         """Get the filename for an image.
 
@@ -378,13 +862,22 @@ class OmeroDatasetMapper(AbstractIsaMapper):
         Returns:
             Path: The image filename as Path object.
         """
-        image_id_str = f"Image:{image_id}"
+        rel_path, abs_path = self.image_paths(image_id)
+        return abs_path if abspath else rel_path
 
-        rel_path = Path(self.image_filenames_mapping[image_id_str])
+    def image_paths(self, image_id):
+        """Get the relative and absolute path of an image file.
 
-        if not abspath:
-            return rel_path
-        return self.path_omero_data / rel_path
+        The image is looked up once for both paths.
+
+        Args:
+            image_id (int): The OMERO image ID.
+
+        Returns:
+            tuple: (relative path, absolute path) as Path objects.
+        """
+        rel_path = Path(self.image_filenames_mapping[f"Image:{image_id}"])
+        return rel_path, self.path_omero_data / rel_path
 
 
 class OmeroProjectMapper(AbstractIsaMapper):
@@ -402,7 +895,6 @@ class OmeroProjectMapper(AbstractIsaMapper):
 
     Examples:
         >>> mapper = OmeroProjectMapper(project)
-        >>> mapper._create_investigation()
         >>> mapper.save_as_json(Path('/export/path'))
         >>> # Creates i_investigation.json
 
@@ -420,7 +912,13 @@ class OmeroProjectMapper(AbstractIsaMapper):
             ome_project (omero.model.ProjectI): The OMERO project to map.
         """
         self.obj = ome_project
+        # each getter may go to the server, so every value is fetched once
+        name = ome_project.getName()
+        description = ome_project.getDescription()
         owner = ome_project.getOwner()
+        last_name = owner.getLastName()
+        first_name = owner.getFirstName()
+        email = owner.getEmail()
 
         self.isa_attribute_config = {
             "investigation": {
@@ -445,9 +943,9 @@ class OmeroProjectMapper(AbstractIsaMapper):
             "investigation_contacts": {
                 "namespace": "ISA:INVESTIGATION:INVESTIGATION CONTACTS",
                 "default_values": {
-                    "last_name": owner.getLastName(),
-                    "first_name": owner.getFirstName(),
-                    "email": owner.getEmail(),
+                    "last_name": last_name,
+                    "first_name": first_name,
+                    "email": email,
                     "phone": None,
                     "fax": None,
                     "address": None,
@@ -469,9 +967,9 @@ class OmeroProjectMapper(AbstractIsaMapper):
                 "namespace": "ISA:STUDY:STUDY",
                 "default_values": {
                     "filename": "",
-                    "identifier": ome_project.getName().lower().replace(" ", "-"),
-                    "title": ome_project.getName(),
-                    "description": ome_project.getDescription(),
+                    "identifier": name.lower().replace(" ", "-"),
+                    "title": name,
+                    "description": description,
                     "submission_date": None,
                     "public_release_date": None,
                 },
@@ -519,16 +1017,31 @@ class OmeroProjectMapper(AbstractIsaMapper):
         Raises:
             IOError: If file cannot be written.
         """
-        out = json.dumps(
-            self.investigation,
-            cls=ISAJSONEncoder,
-            sort_keys=True,
-            indent=4,
-            separators=(',', ': ')
-        )
+        # written while encoding, the serialized investigation is never
+        # held in memory as a whole; the large buffer batches the many
+        # small writes of the encoder into few system calls
+        with open(root_path / "i_investigation.json", "w", buffering=1 << 20) as f:
+            json.dump(
+                self.investigation,
+                f,
+                cls=ISAJSONEncoder,
+                sort_keys=True,
+                indent=4,
+                separators=(',', ': ')
+            )
+
+    @cached_property
+    def investigation(self):
+        """The ISA Investigation of the project.
 
-        with open(root_path / "i_investigation.json", "w") as f:
-            f.write(out)
+        Created by _create_investigation on first access, so it need not be
+        called before save_as_tab or save_as_json.
+
+        Returns:
+            isatools.model.Investigation: The investigation.
+        """
+        self._create_investigation()
+        return vars(self)["investigation"]
 
     def _create_investigation(self):
         """Create the ISA Investigation object from OMERO project.
@@ -538,7 +1051,14 @@ class OmeroProjectMapper(AbstractIsaMapper):
 
         Returns:
             None (sets self.investigation)
+
+        Note:
+            - Only the first call creates the investigation, further calls
+              would add its contacts, publications and study again
         """
+        if "investigation" in vars(self):
+            return
+
         self._create_isa_attributes()
 
         investigation_params = self.isa_attributes["investigation"]["values"][0]
@@ -560,19 +1080,6 @@ class OmeroProjectMapper(AbstractIsaMapper):
         ontology_source = OntologySource(**ontology_source_params)
         self.investigation.ontology_source_references.append(ontology_source)
 
-        def _create_publications(isa_obj, publication_params):
-            """Helper function to add publications to ISA objects.
-
-            Args:
-                isa_obj: The ISA object (Investigation or Study)
-                publication_params: Publication parameters dict
-            """
-            if publication_params is not None:
-                for publication_params, pub_ontology_params in zip(publication_params["values"], publication_params["ontology_values"]):
-                    pub = Publication(**publication_params)
-                    pub.status = pub_ontology_params.get("status", None)
-                    isa_obj.publications.append(pub)
-
         _create_publications(self.investigation, self.isa_attributes.get("investigation_publications", None))
 
         study_params = self.isa_attributes["study"]["values"][0]
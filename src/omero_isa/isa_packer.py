@@ -20,11 +20,20 @@ Author:
 Version:
     0.0.0
 """
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from omero_isa.isa_mapping import OmeroProjectMapper, OmeroDatasetMapper
+from omero_isa.isa_mapping import (
+    OmeroProjectMapper, OmeroDatasetMapper, assay_identifier,
+    fetch_datasets_images, fetch_project_datasets, EXPORT_WORKERS,
+)
 
+# number of datasets mapped concurrently
+DATASET_WORKERS = 4
 
-def pack_isa(ome_object, destination_path, tmp_path, image_filenames_mapping, conn):
+
+def pack_isa(ome_object, destination_path, tmp_path, image_filenames_mapping, conn,
+             copy_mode="copy"):
     """Pack an OMERO project into ISA format.
 
     Convenience function that creates an IsaPacker instance and executes the
@@ -38,6 +47,9 @@ def pack_isa(ome_object, destination_path, tmp_path, image_filenames_mapping, co
         image_filenames_mapping (dict): Mapping of image IDs to filenames
             (e.g., {"Image:123": Path("image.tif")}).
         conn (omero.gateway.BlitzGateway): Active OMERO connection.
+        copy_mode (str, optional): How image files are copied into the
+            export: "link", "reflink" or "copy", see
+            omero_isa.isa_mapping.copy_image_file. Defaults to "copy".
 
     Returns:
         None
@@ -61,7 +73,12 @@ def pack_isa(ome_object, destination_path, tmp_path, image_filenames_mapping, co
         - All OMERO datasets are converted to ISA assays
     """
     packer = IsaPacker(
-        ome_object, destination_path, tmp_path, image_filenames_mapping, conn
+        ome_object,
+        destination_path,
+        tmp_path,
+        image_filenames_mapping,
+        conn,
+        copy_mode=copy_mode,
     )
     packer.pack()
 
@@ -83,6 +100,7 @@ class IsaPacker(object):
         conn (omero.gateway.BlitzGateway): Active OMERO connection.
         image_filenames_mapping (dict): Maps image IDs to filenames.
         path_to_image_files (Path): Path to extracted image files.
+        copy_mode (str): How image files are copied into the export.
         isa_assay_mappers (list): List of OmeroDatasetMapper instances.
         ome_dataset_for_isa_assay (dict): Maps datasets to assays.
 
@@ -113,6 +131,7 @@ class IsaPacker(object):
         tmp_path,
         image_filenames_mapping,
         conn,
+        copy_mode="copy",
     ):
         """Initialize the IsaPacker.
 
@@ -124,6 +143,9 @@ class IsaPacker(object):
             image_filenames_mapping (dict): Maps image IDs to filename paths.
                 Format: {"Image:123": Path("image.tif")}
             conn (omero.gateway.BlitzGateway): Active OMERO connection.
+            copy_mode (str, optional): How image files are copied into the
+                export, see omero_isa.isa_mapping.copy_image_file. Defaults
+                to "copy".
 
         Raises:
             AssertionError: If ome_object is not a Project.
@@ -134,6 +156,7 @@ class IsaPacker(object):
         self.conn = conn
         self.image_filenames_mapping = image_filenames_mapping
         self.path_to_image_files = tmp_path
+        self.copy_mode = copy_mode
 
         self.isa_assay_mappers = []
         self.ome_dataset_for_isa_assay = {}
@@ -174,7 +197,14 @@ class IsaPacker(object):
         ome_project = self.obj
         project_id = ome_project.getId()
 
-        ome_datasets = self.conn.getObjects("Dataset", opts={"project": project_id})
+        # the datasets with their annotations in one query, instead of
+        # listing them and loading the annotations of each
+        ome_datasets, dataset_annotations = fetch_project_datasets(
+            self.conn, project_id
+        )
+        # likewise the images of all datasets with one query
+        dataset_ids = [dataset.getId() for dataset in ome_datasets]
+        dataset_images = fetch_datasets_images(self.conn, dataset_ids)
 
         def _filename_for_image(image_id):
             """Get the filename for an image by ID.
@@ -192,15 +222,50 @@ class IsaPacker(object):
         assert len(investigation.studies) == 1
         study = investigation.studies[0]
 
+        # the worker threads do not use the gateway, which is not
+        # thread-safe: annotations and images are prefetched above, and the
+        # ROIs are exported with a raw service proxy, which is
+        roi_service = self.conn.c.sf.getRoiService()
+
+        # datasets sharing an assay folder are mapped one after the other
+        # in the same task, so their files are not written concurrently
+        folder_groups = defaultdict(list)
+        for dataset in ome_datasets:
+            folder_groups[assay_identifier(dataset)].append(dataset)
+
+        # datasets are mapped concurrently, their images are exported in
+        # one pool shared by all of them
+        with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as export_pool:
+
+            def _map_datasets(datasets):
+                return [
+                    OmeroDatasetMapper(
+                        dataset,
+                        self.conn,
+                        self.path_to_image_files,
+                        self.image_filenames_mapping,
+                        self.destination_path,
+                        image_filename_getter=_filename_for_image,
+                        annotations=dataset_annotations[dataset.getId()],
+                        copy_mode=self.copy_mode,
+                        images=dataset_images[dataset.getId()],
+                        executor=export_pool,
+                        roi_service=roi_service,
+                    )
+                    for dataset in datasets
+                ]
+
+            with ThreadPoolExecutor(max_workers=DATASET_WORKERS) as dataset_pool:
+                mapped = {}
+                for mappers in dataset_pool.map(
+                    _map_datasets, folder_groups.values()
+                ):
+                    for dataset_mapper in mappers:
+                        mapped[dataset_mapper.obj.getId()] = dataset_mapper
+
+        # the assays keep the order of the datasets
         for dataset in ome_datasets:
-            dataset_mapper = OmeroDatasetMapper(
-                dataset,
-                self.conn,
-                self.path_to_image_files,
-                self.image_filenames_mapping,
-                self.destination_path,
-                image_filename_getter=_filename_for_image,
-            )
+            dataset_mapper = mapped[dataset.getId()]
             self.isa_assay_mappers.append(dataset_mapper)
             study.assays.append(dataset_mapper.assay)
 
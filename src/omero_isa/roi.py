@@ -26,9 +26,58 @@ from omero.model import (
 )
 from omero.rtypes import rstring, rint, rdouble
 import json
-
-
-def export_rois_to_json(json_path, image, conn):
+import logging
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# supported shape types by class name
+SHAPE_CLASSES = {
+    cls.__name__: cls
+    for cls in (PolygonI, RectangleI, EllipseI, LineI, PointI, LabelI)
+}
+
+# (JSON key, getter, setter, rtype) of the fields of each shape type
+SHAPE_FIELDS = {
+    "PolygonI": (
+        ("points", "getPoints", "setPoints", rstring),
+    ),
+    "RectangleI": (
+        ("x", "getX", "setX", rdouble),
+        ("y", "getY", "setY", rdouble),
+        ("width", "getWidth", "setWidth", rdouble),
+        ("height", "getHeight", "setHeight", rdouble),
+    ),
+    "EllipseI": (
+        ("x", "getX", "setX", rdouble),
+        ("y", "getY", "setY", rdouble),
+        ("radiusX", "getRadiusX", "setRadiusX", rdouble),
+        ("radiusY", "getRadiusY", "setRadiusY", rdouble),
+    ),
+    "LineI": (
+        ("x1", "getX1", "setX1", rdouble),
+        ("y1", "getY1", "setY1", rdouble),
+        ("x2", "getX2", "setX2", rdouble),
+        ("y2", "getY2", "setY2", rdouble),
+    ),
+    "PointI": (
+        ("x", "getX", "setX", rdouble),
+        ("y", "getY", "setY", rdouble),
+    ),
+    "LabelI": (
+        ("x", "getX", "setX", rdouble),
+        ("y", "getY", "setY", rdouble),
+        ("text", "getTextValue", "setTextValue", rstring),
+    ),
+}
+
+
+def export_rois_to_json(json_path, image, conn, roi_service=None):
     """Export all ROIs from an OMERO image to a JSON file.
 
     Retrieves all ROI objects associated with an image and exports them to
@@ -39,6 +88,10 @@ def export_rois_to_json(json_path, image, conn):
         json_path (str or Path): Path where the JSON file will be saved.
         image (omero.model.ImageI): The OMERO image object to export ROIs from.
         conn (omero.gateway.BlitzGateway): Active OMERO connection.
+        roi_service (omero.api.IRoiPrx, optional): ROI service the ROIs are
+            loaded with. Pass a raw proxy (conn.c.sf.getRoiService()) when
+            calling from another thread than the one using conn, the
+            gateway is not thread-safe. Defaults to conn.getRoiService().
 
     Returns:
         Path or None: The path to the created JSON file if ROIs exist,
@@ -76,82 +129,94 @@ def export_rois_to_json(json_path, image, conn):
         - Only exports ROIs that have shapes
         - Returns None if no ROIs exist (not an error)
         - Preserves dimension information (z, t, c) for each shape
+        - Each ROI is written as soon as it is converted, with orjson if it
+          is installed, so the ROIs are not all held in memory as JSON data
+        - If converting or writing a ROI fails, the partly written file is
+          removed before the error is raised
     """
-    roi_service = conn.getRoiService()
+    if roi_service is None:
+        roi_service = conn.getRoiService()
     result = roi_service.findByImage(image.getId(), None)
 
-    data = []
-    for roi in result.rois:
-        roi_data = {"roi_id": roi.getId().getValue(), "shapes": []}
-        for shape in roi.copyShapes():
-            shape_type = shape.__class__.__name__
-            shape_info = {
-                "type": shape_type,
-                "z": shape.getTheZ().getValue() if shape.getTheZ() else None,
-                "t": shape.getTheT().getValue() if shape.getTheT() else None,
-                "c": shape.getTheC().getValue() if shape.getTheC() else None
-            }
+    # each ROI is written as soon as it is built, the file is only
+    # created for the first one
+    f = None
+    try:
+        for roi in result.rois:
+            roi_data = _roi_to_dict(roi)
+            if f is None:
+                f = open(json_path, "wb")
+                f.write(b"[\n")
+            else:
+                f.write(b",\n")
+            f.write(_dumps(roi_data))
+        if f is None:
+            return None
+        f.write(b"\n]\n")
+        f.close()
+    except BaseException:
+        if f is not None:
+            # no truncated file is left in the export
+            f.close()
+            os.unlink(json_path)
+        raise
+    return json_path
+
+
+def _dumps(roi_data):
+    """Serialize the data of one ROI, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(roi_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(roi_data, indent=2).encode("utf-8")
+
+
+def _roi_to_dict(roi):
+    """Convert an OMERO ROI and its shapes to the JSON structure.
+
+    Args:
+        roi (omero.model.RoiI): The ROI to convert.
+
+    Returns:
+        dict: The ROI ID and its shapes, see export_rois_to_json.
+    """
+    roi_data = {"roi_id": roi.getId().getValue(), "shapes": []}
+    for shape in roi.copyShapes():
+        shape_type = shape.__class__.__name__
+        shape_info = {
+            "type": shape_type,
+            "z": shape.getTheZ().getValue() if shape.getTheZ() else None,
+            "t": shape.getTheT().getValue() if shape.getTheT() else None,
+            "c": shape.getTheC().getValue() if shape.getTheC() else None
+        }
+
+        for key, getter, _, _ in SHAPE_FIELDS.get(shape_type, ()):
+            shape_info[key] = getattr(shape, getter)().getValue()
+
+        roi_data["shapes"].append(shape_info)
+    return roi_data
 
-            if shape_type == "PolygonI":
-                shape_info["points"] = shape.getPoints().getValue()
-            elif shape_type == "RectangleI":
-                shape_info.update({
-                    "x": shape.getX().getValue(),
-                    "y": shape.getY().getValue(),
-                    "width": shape.getWidth().getValue(),
-                    "height": shape.getHeight().getValue()
-                })
-            elif shape_type == "EllipseI":
-                shape_info.update({
-                    "x": shape.getX().getValue(),
-                    "y": shape.getY().getValue(),
-                    "radiusX": shape.getRadiusX().getValue(),
-                    "radiusY": shape.getRadiusY().getValue()
-                })
-            elif shape_type == "LineI":
-                shape_info.update({
-                    "x1": shape.getX1().getValue(),
-                    "y1": shape.getY1().getValue(),
-                    "x2": shape.getX2().getValue(),
-                    "y2": shape.getY2().getValue()
-                })
-            elif shape_type == "PointI":
-                shape_info.update({
-                    "x": shape.getX().getValue(),
-                    "y": shape.getY().getValue()
-                })
-            elif shape_type == "LabelI":
-                shape_info.update({
-                    "x": shape.getX().getValue(),
-                    "y": shape.getY().getValue(),
-                    "text": shape.getTextValue().getValue()
-                })
-
-            roi_data["shapes"].append(shape_info)
-        data.append(roi_data)
-
-    if len(data) > 0:
-        with open(json_path, "w") as f:
-            json.dump(data, f, indent=2)
-        return json_path
-    return None
-
-
-def import_rois_from_json(json_path, image, conn):
+
+def import_rois_from_json(json_path, image, conn, update=None):
     """Import ROIs from a JSON file into an OMERO image.
 
     Reads ROI definitions from a JSON file and creates ROI objects in OMERO.
     Supports all standard OMERO shape types. Each ROI and its shapes are
-    properly linked to the target image.
+    properly linked to the target image. All ROIs of the file are saved
+    with a single call.
 
     Args:
-        json_path (str or Path): Path to the JSON file containing ROI definitions.
-        image (omero.model.ImageI): The target OMERO image to import ROIs into.
+        json_path (str or Path): Path to the JSON file containing ROI
+            definitions.
+        image (omero.gateway.ImageWrapper or omero.model.ImageI): The target
+            OMERO image to import ROIs into. An unloaded ImageI is enough.
         conn (omero.gateway.BlitzGateway): Active OMERO connection.
+        update (omero.api.IUpdatePrx, optional): Update service the ROIs are
+            saved with. Pass a raw proxy (conn.c.sf.getUpdateService()) when
+            calling from another thread than the one using conn, the
+            gateway is not thread-safe. Defaults to conn.getUpdateService().
 
     Returns:
-        omero.model.RoiI: The first imported ROI object (when importing multiple
-            ROIs, the first one is returned for backwards compatibility).
+        list: The saved omero.model.RoiI objects, in the order of the file.
 
     Raises:
         FileNotFoundError: If the JSON file doesn't exist.
@@ -162,8 +227,8 @@ def import_rois_from_json(json_path, image, conn):
     Examples:
         >>> conn = BlitzGateway(...)
         >>> image = conn.getObject("Image", 123)
-        >>> roi = import_rois_from_json(Path("rois.json"), image, conn)
-        >>> print(f"Imported {len(roi.copyShapes())} shapes")
+        >>> rois = import_rois_from_json(Path("rois.json"), image, conn)
+        >>> print(f"Imported {len(rois[0].copyShapes())} shapes")
         Imported 3 shapes
 
     Supported Shape Types:
@@ -193,17 +258,23 @@ def import_rois_from_json(json_path, image, conn):
     Note:
         - All shapes must have z, t, c coordinates (can be None)
         - Unknown shape types are skipped
-        - Each ROI is saved separately to OMERO
+        - All ROIs are saved to OMERO together with saveAndReturnArray
         - Default z, t, c to 0 if not specified
+        - The file is read with a single read call and parsed with orjson
+          if it is installed
     """
-    with open(json_path, "r") as f:
-        roi_data_list = json.load(f)
+    with open(json_path, "rb") as f:
+        content = f.read()
 
-    update_service = conn.getUpdateService()
+    if orjson is not None:
+        roi_data_list = orjson.loads(content)
+    else:
+        roi_data_list = json.loads(content)
 
+    rois = []
     for roi_data in roi_data_list:
         roi = RoiI()
-        roi.setImage(image._obj)
+        roi.setImage(getattr(image, "_obj", image))
 
         for shape_info in roi_data["shapes"]:
             shape_type = shape_info["type"]
@@ -211,44 +282,24 @@ def import_rois_from_json(json_path, image, conn):
             t = rint(shape_info["t"] or 0)
             c = rint(shape_info["c"] or 0)
 
-            if shape_type == "PolygonI":
-                shape = PolygonI()
-                shape.setPoints(rstring(shape_info["points"]))
-            elif shape_type == "RectangleI":
-                shape = RectangleI()
-                shape.setX(rdouble(shape_info["x"]))
-                shape.setY(rdouble(shape_info["y"]))
-                shape.setWidth(rdouble(shape_info["width"]))
-                shape.setHeight(rdouble(shape_info["height"]))
-            elif shape_type == "EllipseI":
-                shape = EllipseI()
-                shape.setX(rdouble(shape_info["x"]))
-                shape.setY(rdouble(shape_info["y"]))
-                shape.setRadiusX(rdouble(shape_info["radiusX"]))
-                shape.setRadiusY(rdouble(shape_info["radiusY"]))
-            elif shape_type == "LineI":
-                shape = LineI()
-                shape.setX1(rdouble(shape_info["x1"]))
-                shape.setY1(rdouble(shape_info["y1"]))
-                shape.setX2(rdouble(shape_info["x2"]))
-                shape.setY2(rdouble(shape_info["y2"]))
-            elif shape_type == "PointI":
-                shape = PointI()
-                shape.setX(rdouble(shape_info["x"]))
-                shape.setY(rdouble(shape_info["y"]))
-            elif shape_type == "LabelI":
-                shape = LabelI()
-                shape.setX(rdouble(shape_info["x"]))
-                shape.setY(rdouble(shape_info["y"]))
-                shape.setTextValue(rstring(shape_info["text"]))
-            else:
+            shape_class = SHAPE_CLASSES.get(shape_type)
+            if shape_class is None:
                 continue
+            shape = shape_class()
+            for key, _, setter, rtype in SHAPE_FIELDS[shape_type]:
+                getattr(shape, setter)(rtype(shape_info[key]))
 
             shape.setTheZ(z)
             shape.setTheT(t)
             shape.setTheC(c)
             roi.addShape(shape)
 
-        print(f"import ROI from file {json_path}")
-        update_service.saveAndReturnObject(roi)
-        return roi
+        rois.append(roi)
+
+    if not rois:
+        return []
+    logger.info("import %d ROIs from file %s", len(rois), json_path)
+    if update is None:
+        update = conn.getUpdateService()
+    # all ROIs with their shapes in one call
+    return update.saveAndReturnArray(rois, conn.SERVICE_OPTS)
@@ -0,0 +1,152 @@
+import socket
+import threading
+
+import pytest
+
+import omero_isa.agent
+from omero_isa.agent import ConnectionPool, request_import
+
+
+class FakeConnection:
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self.alive = True
+        self.closed = False
+
+    def keepAlive(self):
+        if isinstance(self.alive, Exception):
+            raise self.alive
+        return self.alive
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    opened = []
+
+    def connect(username, password, server, port):
+        conn = FakeConnection((username, password, server, port))
+        opened.append(conn)
+        return conn
+
+    pool = ConnectionPool(connect)
+    pool.opened = opened
+    return pool
+
+
+def test_connection_pool_reuses_connection(pool):
+    conn = pool.get("admin", "secret", "localhost", 4064)
+    assert pool.get("admin", "secret", "localhost", 4064) is conn
+    assert len(pool.opened) == 1
+
+
+def test_connection_pool_keys_by_credentials(pool):
+    conn = pool.get("admin", "secret", "localhost", 4064)
+    assert pool.get("admin", "other", "localhost", 4064) is not conn
+    assert pool.get("user", "secret", "localhost", 4064) is not conn
+    assert pool.get("admin", "secret", "localhost", 4063) is not conn
+    assert pool.get("admin", "secret", "omero.example.org", 4064) is not conn
+    assert len(pool.opened) == 5
+    assert not conn.closed
+
+
+def test_connection_pool_replaces_expired_connection(pool):
+    conn = pool.get("admin", "secret", "localhost", 4064)
+    conn.alive = False
+    new_conn = pool.get("admin", "secret", "localhost", 4064)
+    assert new_conn is not conn
+    assert conn.closed
+    assert not new_conn.closed
+
+
+def test_connection_pool_keep_alive(pool):
+    alive = pool.get("admin", "secret", "localhost", 4064)
+    dead = pool.get("user", "secret", "localhost", 4064)
+    failing = pool.get("guest", "secret", "localhost", 4064)
+    dead.alive = False
+    failing.alive = RuntimeError("connection lost")
+
+    pool.keep_alive()
+
+    assert not alive.closed
+    assert dead.closed
+    assert failing.closed
+    assert pool.get("admin", "secret", "localhost", 4064) is alive
+    assert pool.get("user", "secret", "localhost", 4064) is not dead
+
+
+def test_connection_pool_close(pool):
+    conns = [
+        pool.get("admin", "secret", "localhost", 4064),
+        pool.get("user", "secret", "localhost", 4064),
+    ]
+    pool.close()
+    assert all(conn.closed for conn in conns)
+    assert pool.get("admin", "secret", "localhost", 4064) not in conns
+
+
+@pytest.fixture
+def agent_socket(tmp_path):
+    """Run a fake agent that answers each request with handle(request)."""
+    path = tmp_path / "agent.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+    handlers = []
+
+    def _serve():
+        conn, _ = server.accept()
+        with conn, conn.makefile("rwb") as f:
+            handlers[0](f)
+
+    thread = threading.Thread(target=_serve, daemon=True)
+    yield path, handlers, thread
+    server.close()
+
+
+def _run_agent(agent_socket, handler):
+    path, handlers, thread = agent_socket
+    handlers.append(handler)
+    thread.start()
+    return path
+
+
+def test_request_import_without_agent(tmp_path):
+    assert request_import(tmp_path / "agent.sock", {}) is None
+
+
+def test_request_import(agent_socket):
+    def reply(f):
+        f.readline()
+        f.write(b'{"project_id": 1, "project_name": "My Project"}\n')
+
+    path = _run_agent(agent_socket, reply)
+    assert request_import(path, {"project_name": "My Project"}) == {
+        "project_id": 1, "project_name": "My Project",
+    }
+
+
+@pytest.mark.parametrize("reply", [b"", b"{trunc", b"[]\n"])
+def test_request_import_invalid_reply(agent_socket, reply):
+    def handler(f):
+        f.readline()
+        f.write(reply)
+
+    path = _run_agent(agent_socket, handler)
+    with pytest.raises(RuntimeError, match="without a valid reply"):
+        request_import(path, {})
+
+
+def test_request_import_timeout(agent_socket, monkeypatch):
+    done = threading.Event()
+    monkeypatch.setattr(omero_isa.agent, "REPLY_TIMEOUT", 0.1)
+
+    path = _run_agent(agent_socket, lambda f: done.wait(5))
+    try:
+        with pytest.raises(RuntimeError, match="did not reply"):
+            request_import(path, {})
+    finally:
+        done.set()
@@ -0,0 +1,134 @@
+import argparse
+import os
+import sys
+
+import pytest
+
+import omero_isa.cli
+from omero_isa.cli import (
+    check_import_arguments, check_json_start, create_argument_parser,
+    import_batch, intern_tree, load_cached_investigation,
+    store_cached_investigation, INTERN_MAX_LENGTH,
+)
+
+
+def _parse(*argv):
+    parser = create_argument_parser()
+    return parser, parser.parse_args(list(argv))
+
+
+def test_check_import_arguments_complete():
+    parser, args = _parse(
+        "-u", "admin", "-w", "secret", "-s", "localhost",
+        "My Project", "i_investigation.json",
+    )
+    check_import_arguments(parser, args)
+
+
+def test_check_import_arguments_missing(capsys):
+    parser, args = _parse("-u", "admin", "My Project")
+    with pytest.raises(SystemExit):
+        check_import_arguments(parser, args)
+    error = capsys.readouterr().err.splitlines()[-1]
+    assert error.endswith(
+        "required: investigation_file, -w/--password, -s/--server"
+    )
+
+
+def test_check_import_arguments_batch():
+    parser, args = _parse(
+        "-u", "admin", "-w", "secret", "-s", "localhost",
+        "--batch", "manifest.json",
+    )
+    check_import_arguments(parser, args)
+
+
+def test_check_import_arguments_batch_with_positionals(capsys):
+    parser, args = _parse(
+        "-u", "admin", "-w", "secret", "-s", "localhost",
+        "--batch", "manifest.json", "My Project",
+    )
+    with pytest.raises(SystemExit):
+        check_import_arguments(parser, args)
+    assert "--batch cannot be combined" in capsys.readouterr().err
+
+
+def _batch_args(manifest):
+    return argparse.Namespace(
+        batch=str(manifest), username="admin", password="secret",
+        server="localhost", port=4064, verbose=False,
+    )
+
+
+def test_import_batch_manifest_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        import_batch(_batch_args(tmp_path / "manifest.json"))
+
+
+@pytest.mark.parametrize("content", [
+    b"{not json",
+    b'{"investigation_file": "i_investigation.json"}',
+    b'[{"project_name": "My Project"}]',
+    b'["i_investigation.json"]',
+])
+def test_import_batch_invalid_manifest(tmp_path, content):
+    # rejected before connecting to OMERO
+    manifest = tmp_path / "manifest.json"
+    manifest.write_bytes(content)
+    with pytest.raises(ValueError):
+        import_batch(_batch_args(manifest))
+
+
+@pytest.mark.parametrize("head", [
+    b"{", b"[", b"  \n\t{\"studies\": []}", b"\r\n[", b"", b" \n",
+])
+def test_check_json_start_accepts(head):
+    check_json_start(head, "i_investigation.json")
+
+
+@pytest.mark.parametrize("head", [
+    b"<html>", b"PK\x03\x04", b"  Source Name\t", b"\"string\"",
+])
+def test_check_json_start_rejects(head):
+    with pytest.raises(ValueError, match="i_investigation.json"):
+        check_json_start(head, "i_investigation.json")
+
+
+def test_intern_tree():
+    long_value = "x" * (INTERN_MAX_LENGTH + 1)
+    data = {
+        "studies": [
+            {"title": "".join(["My ", "Study"]), "comments": [1, 2.5, None]},
+            {"title": "".join(["My ", "Study"]), "description": long_value},
+            {"description": "".join(["x"] * (INTERN_MAX_LENGTH + 1))},
+        ],
+        "flag": True,
+    }
+    result = intern_tree(data)
+
+    assert result == data
+    first, second, third = result["studies"]
+    # short strings and all keys are interned
+    assert first["title"] is sys.intern("My Study")
+    assert first["title"] is second["title"]
+    for study in result["studies"]:
+        for key in study:
+            assert key is sys.intern(key)
+    # long strings are shared within the tree
+    assert second["description"] is third["description"]
+
+
+def test_investigation_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(omero_isa.cli, "PARSE_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(omero_isa.cli, "PARSE_CACHE_ENTRIES", 2)
+    for i, digest in enumerate(["a", "b", "c"]):
+        store_cached_investigation(digest, {"studies": [{"title": str(i)}]})
+        os.utime(tmp_path / f"{digest}.json", (i, i))
+
+    assert load_cached_investigation("a") is None
+    assert load_cached_investigation("c") == {"studies": [{"title": "2"}]}
+    # only the most recently used entries are kept, without temp files
+    store_cached_investigation("d", {"studies": []})
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "c.json", "d.json",
+    ]
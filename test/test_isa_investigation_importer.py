@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip("omero")
+
+from omero_isa.isa_investigation_importer import (  # noqa: E402
+    AnnotationDataError, ImageFactory, MappedAnnotationFactory,
+    _comments_to_dict, _named_values, cached_file_size, file_exists,
+)
+
+
+def test_file_exists(tmp_path):
+    (tmp_path / "image.tif").write_bytes(b"0123456789")
+    (tmp_path / "folder").mkdir()
+    listings = {}
+
+    assert file_exists(tmp_path / "image.tif", listings)
+    assert not file_exists(tmp_path / "other.tif", listings)
+    # directories are not files
+    assert not file_exists(tmp_path / "folder", listings)
+    assert listings == {tmp_path: {"image.tif": 10}}
+
+
+def test_file_exists_uses_cached_listing(tmp_path):
+    listings = {}
+    assert not file_exists(tmp_path / "image.tif", listings)
+    # files created after the directory was listed are not seen
+    (tmp_path / "image.tif").write_bytes(b"")
+    assert not file_exists(tmp_path / "image.tif", listings)
+    assert file_exists(tmp_path / "image.tif", {})
+
+
+def test_file_exists_missing_directory(tmp_path):
+    listings = {}
+    assert not file_exists(tmp_path / "missing" / "image.tif", listings)
+    assert listings == {tmp_path / "missing": {}}
+
+
+def test_named_values_strings():
+    items = (("identifier", "my-assay"), ("title", "My Assay"))
+    values = _named_values(items)
+    assert [(v.name, v.value) for v in values] == list(items)
+    # cached for mappings with string values only
+    assert _named_values(items) is values
+
+
+def test_named_values_non_strings():
+    # equal as cache keys, but with different strings
+    for value, text in ((1, "1"), (1.0, "1.0"), (True, "True")):
+        values = _named_values((("value", value),))
+        assert [(v.name, v.value) for v in values] == [("value", text)]
+
+
+def test_cached_file_size(tmp_path):
+    (tmp_path / "image.tif").write_bytes(b"0123456789")
+    listings = {}
+    assert cached_file_size(tmp_path / "image.tif", listings) == 10
+    assert cached_file_size(tmp_path / "other.tif", listings) is None
+
+
+def test_image_factory_file_size(tmp_path):
+    arc = tmp_path / "arc"
+    (arc / "assays").mkdir(parents=True)
+    (arc / "assays" / "image.tif").write_bytes(b"01234")
+    path_to_arc = arc / "i_investigation.json"
+
+    def factory(name):
+        return ImageFactory({"name": name}, path_to_arc)
+
+    assert factory("assays/image.tif").file_size() == 5
+    assert factory("assays/missing.tif").file_size() == 0
+    assert factory("").file_size() == 0
+
+
+def test_mapped_annotation_factory_invalid_data():
+    with pytest.raises(AnnotationDataError) as exc_info:
+        MappedAnnotationFactory({"comments": []})
+    assert isinstance(exc_info.value, ValueError)
+    assert isinstance(exc_info.value, AssertionError)
+
+
+def test_comments_to_dict():
+    data = {"comments": [
+        {"name": "identifier", "value": "first"},
+        {"name": "title", "value": "My Assay"},
+        {"name": "identifier", "value": "second"},
+    ]}
+    assert _comments_to_dict(data) == {
+        "identifier": "second", "title": "My Assay",
+    }
+    assert _comments_to_dict(data, first_wins=True) == {
+        "identifier": "first", "title": "My Assay",
+    }
+    assert _comments_to_dict({}) == {}
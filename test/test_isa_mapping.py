@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+pytest.importorskip("omero")
+pytest.importorskip("isatools")
+
+from omero_isa.isa_mapping import _NamedValues, copy_image_file  # noqa: E402
+
+
+@pytest.fixture
+def image_file(tmp_path):
+    src = tmp_path / "src" / "image.tif"
+    src.parent.mkdir()
+    src.write_bytes(b"\x49\x49\x2a\x00" + os.urandom(4096))
+    return src
+
+
+@pytest.mark.parametrize("copy_mode", ["copy", "link", "reflink"])
+def test_copy_image_file(tmp_path, image_file, copy_mode):
+    dst = tmp_path / "image.tif"
+    copy_image_file(image_file, dst, copy_mode)
+    assert dst.read_bytes() == image_file.read_bytes()
+    assert dst.stat().st_mtime == pytest.approx(image_file.stat().st_mtime)
+
+
+def test_copy_image_file_default_copies(tmp_path, image_file):
+    dst = tmp_path / "image.tif"
+    copy_image_file(image_file, dst)
+    assert not os.path.samefile(image_file, dst)
+
+
+def test_copy_image_file_link(tmp_path, image_file):
+    dst = tmp_path / "image.tif"
+    copy_image_file(image_file, dst, "link")
+    assert os.path.samefile(image_file, dst)
+
+
+@pytest.mark.parametrize("copy_mode", ["copy", "link", "reflink"])
+def test_copy_image_file_replaces_existing(tmp_path, image_file, copy_mode):
+    dst = tmp_path / "image.tif"
+    dst.write_bytes(b"previous export")
+    copy_image_file(image_file, dst, copy_mode)
+    assert dst.read_bytes() == image_file.read_bytes()
+
+
+def test_copy_image_file_invalid_mode(tmp_path, image_file):
+    dst = tmp_path / "image.tif"
+    with pytest.raises(ValueError, match="copy_mode"):
+        copy_image_file(image_file, dst, "symlink")
+    assert not dst.exists()
+
+
+def test_named_values():
+    pairs = [
+        ("identifier", "my-assay"),
+        ("title", "My Assay"),
+        ("identifier", "my-assay-2"),
+    ]
+    values = _NamedValues(pairs)
+
+    # like a dict built from the pairs, the last value wins
+    assert values.get("identifier") == "my-assay-2"
+    assert values.get("title") == "My Assay"
+    assert values.get("description") is None
+    assert values.get("description", "") == ""
+    assert list(values.items()) == pairs
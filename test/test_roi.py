@@ -0,0 +1,186 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("omero")
+
+from omero.model import ImageI, RoiI  # noqa: E402
+from omero.rtypes import rint, rlong  # noqa: E402
+
+from omero_isa.roi import (  # noqa: E402
+    SHAPE_CLASSES, SHAPE_FIELDS, export_rois_to_json, import_rois_from_json,
+)
+
+# field values of one shape of each supported type
+SHAPE_VALUES = {
+    "PolygonI": {"points": "10,10 20,20 30,10"},
+    "RectangleI": {"x": 1.5, "y": 2.0, "width": 30.0, "height": 40.25},
+    "EllipseI": {"x": 50.0, "y": 60.0, "radiusX": 5.0, "radiusY": 7.5},
+    "LineI": {"x1": 0.0, "y1": 1.0, "x2": 10.0, "y2": 11.0},
+    "PointI": {"x": 3.0, "y": 4.0},
+    "LabelI": {"x": 8.0, "y": 9.0, "text": "nucleus"},
+}
+
+
+class FakeRoiService:
+
+    def __init__(self, rois):
+        self.rois = rois
+
+    def findByImage(self, image_id, options):
+        return SimpleNamespace(rois=self.rois)
+
+
+class FakeUpdateService:
+
+    def __init__(self):
+        self.calls = 0
+
+    def saveAndReturnArray(self, objects, ctx=None):
+        self.calls += 1
+        self.saved = objects
+        return objects
+
+
+@pytest.fixture
+def conn():
+    return SimpleNamespace(SERVICE_OPTS=None)
+
+
+def _shape(shape_type, z=0, t=0, c=0):
+    shape = SHAPE_CLASSES[shape_type]()
+    for key, _, setter, rtype in SHAPE_FIELDS[shape_type]:
+        getattr(shape, setter)(rtype(SHAPE_VALUES[shape_type][key]))
+    shape.setTheZ(rint(z))
+    shape.setTheT(rint(t))
+    shape.setTheC(rint(c))
+    return shape
+
+
+def _roi(roi_id, shapes):
+    roi = RoiI()
+    roi.setId(rlong(roi_id))
+    for shape in shapes:
+        roi.addShape(shape)
+    return roi
+
+
+def test_shape_fields():
+    assert SHAPE_FIELDS.keys() == SHAPE_CLASSES.keys()
+    for shape_type, fields in SHAPE_FIELDS.items():
+        shape = SHAPE_CLASSES[shape_type]()
+        keys = [key for key, _, _, _ in fields]
+        assert len(keys) == len(set(keys))
+        assert keys == list(SHAPE_VALUES[shape_type])
+        for key, getter, setter, rtype in fields:
+            getattr(shape, setter)(rtype(SHAPE_VALUES[shape_type][key]))
+            assert getattr(shape, getter)().getValue() == \
+                SHAPE_VALUES[shape_type][key]
+
+
+def test_export_rois_to_json(tmp_path, conn):
+    rois = [
+        _roi(1, [_shape("PolygonI", z=2, t=1, c=0)]),
+        _roi(2, [_shape("RectangleI"), _shape("LabelI")]),
+    ]
+    json_path = tmp_path / "image_roidata.json"
+    result = export_rois_to_json(
+        json_path, ImageI(1, False), conn, roi_service=FakeRoiService(rois)
+    )
+
+    assert result == json_path
+    data = json.loads(json_path.read_text())
+    assert [roi["roi_id"] for roi in data] == [1, 2]
+    assert data[0]["shapes"] == [
+        {"type": "PolygonI", "z": 2, "t": 1, "c": 0,
+         **SHAPE_VALUES["PolygonI"]},
+    ]
+    assert [shape["type"] for shape in data[1]["shapes"]] == [
+        "RectangleI", "LabelI",
+    ]
+
+
+def test_export_rois_to_json_without_rois(tmp_path, conn):
+    json_path = tmp_path / "image_roidata.json"
+    result = export_rois_to_json(
+        json_path, ImageI(1, False), conn, roi_service=FakeRoiService([])
+    )
+    assert result is None
+    assert not json_path.exists()
+
+
+def test_export_rois_to_json_removes_partial_file(tmp_path, conn):
+    class BrokenRoi:
+        def getId(self):
+            return rlong(2)
+
+        def copyShapes(self):
+            raise RuntimeError("shape not loaded")
+
+    rois = [_roi(1, [_shape("PointI")]), BrokenRoi()]
+    json_path = tmp_path / "image_roidata.json"
+    with pytest.raises(RuntimeError):
+        export_rois_to_json(
+            json_path, ImageI(1, False), conn, roi_service=FakeRoiService(rois)
+        )
+    assert not json_path.exists()
+
+
+def test_roi_round_trip(tmp_path, conn):
+    rois = [
+        _roi(i + 1, [_shape(shape_type, z=i, t=2 * i, c=1)])
+        for i, shape_type in enumerate(SHAPE_CLASSES)
+    ]
+    json_path = tmp_path / "image_roidata.json"
+    export_rois_to_json(
+        json_path, ImageI(1, False), conn, roi_service=FakeRoiService(rois)
+    )
+
+    image = ImageI(7, False)
+    update = FakeUpdateService()
+    imported = import_rois_from_json(json_path, image, conn, update=update)
+
+    # all ROIs are saved with one call
+    assert update.calls == 1
+    assert imported is update.saved
+    assert len(imported) == len(rois)
+    for roi, original in zip(imported, rois):
+        assert roi.getImage() is image
+        (shape,) = roi.copyShapes()
+        (original_shape,) = original.copyShapes()
+        shape_type = type(original_shape).__name__
+        assert type(shape).__name__ == shape_type
+        for name in ("getTheZ", "getTheT", "getTheC"):
+            assert getattr(shape, name)().getValue() == \
+                getattr(original_shape, name)().getValue()
+        for _, getter, _, _ in SHAPE_FIELDS[shape_type]:
+            assert getattr(shape, getter)().getValue() == \
+                getattr(original_shape, getter)().getValue()
+
+
+def test_import_rois_from_json_skips_unknown_shapes(tmp_path, conn):
+    json_path = tmp_path / "image_roidata.json"
+    json_path.write_text(json.dumps([{
+        "roi_id": 1,
+        "shapes": [
+            {"type": "MaskI", "z": 0, "t": 0, "c": 0},
+            {"type": "PointI", "z": None, "t": None, "c": None,
+             "x": 3.0, "y": 4.0},
+        ],
+    }]))
+    update = FakeUpdateService()
+    (roi,) = import_rois_from_json(json_path, ImageI(1, False), conn, update=update)
+
+    (shape,) = roi.copyShapes()
+    assert type(shape).__name__ == "PointI"
+    assert shape.getTheZ().getValue() == 0
+
+
+def test_import_rois_from_json_empty(tmp_path, conn):
+    json_path = tmp_path / "image_roidata.json"
+    json_path.write_text("[]")
+    update = FakeUpdateService()
+    assert import_rois_from_json(json_path, ImageI(1, False), conn,
+                                 update=update) == []
+    assert update.calls == 0